@@ -0,0 +1,59 @@
+# Benchmark backend aritmetika untuk modulus 64-4096 bit. Kolom context: pemangkatan berulang
+# dengan kunci yang sama lewat backend.context (prakomputasi per kunci), ct: jendela tetap Montgomery.
+# Jalankan dari root repo: python -m benchmarks.bench_backend [--bits 64 256 1024] [--backends builtin gmpy2]
+import argparse
+import math
+import random
+import timeit
+
+from rsa_core.backend import BACKENDS
+from rsa_core.montgomery import FixedWindow
+
+DEFAULT_BITS = (64, 128, 256, 512, 1024, 2048, 4096)
+
+def _operands(bits, rng):
+    mod = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+    base = rng.randrange(2, mod)
+    exp = rng.getrandbits(bits) | (1 << (bits - 1))
+    phi = mod - 1
+    e = rng.randrange(3, phi) | 1
+    while math.gcd(e, phi) != 1:
+        e = rng.randrange(3, phi) | 1
+    return base, exp, mod, e, phi
+
+def _time_per_call(fn, *args):
+    timer = timeit.Timer(lambda: fn(*args))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=3, number=number))
+    return best / number
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark backend mod_exp / mod_inverse")
+    parser.add_argument("--bits", type=int, nargs="+", default=DEFAULT_BITS)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    names = [name for name in args.backends if name in BACKENDS]
+    print(f"{'bits':>6} {'backend':>8} {'mod_exp (us)':>14} {'context (us)':>13} {'ct (us)':>10} "
+          f"{'mod_inverse (us)':>17}")
+    for bits in args.bits:
+        base, exp, mod, e, phi = _operands(bits, rng)
+        expected = pow(base, exp, mod)
+        constant_time = FixedWindow(exp, mod)
+        assert constant_time(base) == expected
+        ct_time = _time_per_call(constant_time, base)
+        for name in names:
+            backend = BACKENDS[name]
+            assert backend.mod_exp(base, exp, mod) == expected
+            context = backend.context(exp, mod)
+            assert context(base) == expected
+            exp_time = _time_per_call(backend.mod_exp, base, exp, mod)
+            ctx_time = _time_per_call(context, base)
+            inv_time = _time_per_call(backend.mod_inverse, e, phi)
+            print(f"{bits:>6} {name:>8} {exp_time * 1e6:>14.1f} {ctx_time * 1e6:>13.1f} {ct_time * 1e6:>10.1f} "
+                  f"{inv_time * 1e6:>17.1f}")
+
+if __name__ == "__main__":
+    main()
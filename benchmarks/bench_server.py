@@ -0,0 +1,76 @@
+# Uji beban layanan HTTP: banyak permintaan /encrypt kecil secara bersamaan dengan satu kunci.
+# Tanpa --port, server dijalankan di proses ini pada port acak.
+# Jalankan dari root repo: python -m benchmarks.bench_server [--requests 2000] [--concurrency 200]
+import argparse
+import asyncio
+import time
+
+from rsa_core import parallel
+from rsa_core.server import DEFAULT_HOST, RSAServer, ServiceClient
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+async def _run(args):
+    server = None
+    port = args.port
+    if port is None:
+        server = await RSAServer(port=0, delay=args.batch_delay / 1000).start()
+        port = server.port
+    clients = [ServiceClient(args.host, port) for _ in range(args.concurrency)]
+    try:
+        status, key = await clients[0].request("POST", "/keygen", {"bits": args.bits})
+        assert status == 200, key
+        payload = {"n": key["n"], "e": key["e"], "mode": args.mode}
+        # pemanasan: worker pool dibuat saat batch pertama
+        await clients[0].request("POST", "/encrypt", dict(payload, message="x"))
+
+        latencies = []
+        queue = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(f"pesan nomor {i}")
+
+        async def worker(client):
+            while not queue.empty():
+                message = queue.get_nowait()
+                started = time.perf_counter()
+                status, result = await client.request("POST", "/encrypt", dict(payload, message=message))
+                latencies.append(time.perf_counter() - started)
+                assert status == 200, result
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for client in clients))
+        elapsed = time.perf_counter() - started
+        _, stats = await clients[0].request("GET", "/stats")
+    finally:
+        for client in clients:
+            await client.close()
+        if server is not None:
+            await server.close()
+
+    latencies.sort()
+    batcher = stats["batcher"]
+    print(f"{args.requests} permintaan, {args.concurrency} koneksi, {args.bits} bit, mode {args.mode}")
+    print(f"throughput {args.requests / elapsed:.0f} req/s")
+    print("latensi (ms): " + ", ".join(
+        f"p{int(q * 100)} {_percentile(latencies, q) * 1e3:.1f}" for q in (0.5, 0.9, 0.99)) +
+        f", max {latencies[-1] * 1e3:.1f}")
+    print(f"batch: {batcher['batches']}, rata-rata {batcher['avg_requests_per_batch']:.1f} permintaan/batch")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark layanan HTTP RSA (micro-batching)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, help="port server yang sudah berjalan (default: jalankan server sendiri)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--bits", type=int, default=1024)
+    parser.add_argument("--mode", choices=["karakter", "blok"], default="blok")
+    parser.add_argument("--batch-delay", type=float, default=2.0, help="ms, hanya untuk server internal")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    finally:
+        parallel.shutdown()
+
+if __name__ == "__main__":
+    main()
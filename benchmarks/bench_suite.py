@@ -0,0 +1,276 @@
+# Benchmark semua primitif RSA dan pipeline end-to-end: is_prime, generate_prime,
+# generate_random_prime, mod_exp, mod_inverse, encrypt_text, decrypt_text, pipeline
+# streaming (enkripsi -> container biner -> dekripsi), dan batch banyak kunci (encrypt_rows).
+# Input dibuat dari seed tetap per kasus sehingga hasil bisa dibandingkan antar-run; cache
+# dibersihkan sebelum setiap panggilan. Semua kasus berjalan serial di proses ini (pool worker
+# rsa_core/parallel.py tidak dipakai), agar cache yang dibersihkan memang cache yang dipakai
+# dan waktu tidak memuat start-up pool atau IPC.
+#
+# Jalankan dari root repo:
+#   python -m benchmarks.bench_suite [--bits 64 1024] [--lengths 64 16384] [--only encrypt]
+#   python -m benchmarks.bench_suite --save baseline.json
+#   python -m benchmarks.bench_suite --compare baseline.json --threshold 0.15
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from rsa_core import backend, expcache, parallel, primality, vector
+from rsa_core.batch import encrypt_rows
+from rsa_core.cipher import decrypt_text, encrypt_text
+from rsa_core.container import ContainerReader, write_container
+from rsa_core.keys import make_private_key
+from rsa_core.primegen import generate_prime, generate_random_prime
+from rsa_core.stream import decrypt_batches, encrypt_batches, iter_plain_batches, iter_text
+
+DEFAULT_BITS = (64, 256, 1024, 2048)
+DEFAULT_LENGTHS = (64, 1024, 16384)
+DEFAULT_E = 65537
+# Ambang default: p50 lebih lambat > 10% dari baseline dianggap regresi
+DEFAULT_THRESHOLD = 0.10
+# Kasus batch: jumlah baris dan jumlah kunci berbeda di dalamnya
+BATCH_ROWS = 1000
+BATCH_KEYS = 10
+TEXT = "RSA benchmark — ünïcode ✓ teks contoh. "
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def _odd(bits, rng):
+    return rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+
+# Pasangan kunci deterministik (generate_keypair memakai SystemRandom)
+def _keypair(bits, rng, e=DEFAULT_E):
+    while True:
+        p = generate_prime(bits - bits // 2, rng)
+        q = generate_prime(bits // 2, rng)
+        phi = (p - 1) * (q - 1)
+        if p != q and math.gcd(e, phi) == 1:
+            n, d = p * q, pow(e, -1, phi)
+            return n, d, make_private_key(p, q, d)
+
+def _message(length):
+    return (TEXT * (length // len(TEXT) + 1))[:length]
+
+def _reset_caches():
+    expcache.clear()
+
+# Setiap kasus: fungsi (params, rng) -> (op, unit per op). op() dijalankan berulang kali dan diukur.
+def case_is_prime(bits, rng):
+    values = [_odd(bits, rng) for _ in range(64)]
+    it = iter(values * 1000)
+    return lambda: primality.is_prime_uncached(next(it)), 1
+
+def case_is_prime_prime(bits, rng):
+    primes = [generate_prime(bits, rng) for _ in range(4)]
+    it = iter(primes * 10000)
+    return lambda: primality.is_prime_uncached(next(it)), 1
+
+def case_generate_prime(bits, rng):
+    return lambda: generate_prime(bits, rng), 1
+
+def case_generate_random_prime(rng):
+    return lambda: generate_random_prime(rng=rng), 1
+
+def case_mod_exp(bits, rng):
+    mod = _odd(bits, rng)
+    base, exp = rng.randrange(2, mod), rng.getrandbits(bits) | (1 << (bits - 1))
+    return lambda: backend.mod_exp(base, exp, mod), 1
+
+def case_mod_inverse(bits, rng):
+    phi = _odd(bits, rng) - 1
+    e = rng.randrange(3, phi) | 1
+    while math.gcd(e, phi) != 1:
+        e = rng.randrange(3, phi) | 1
+    return lambda: backend.mod_inverse(e, phi), 1
+
+def case_encrypt_text(bits, length, mode, rng):
+    n, _, _ = _keypair(bits, rng)
+    text = _message(length)
+
+    def op():
+        _reset_caches()
+        encrypt_text(text, DEFAULT_E, n, True, mode)
+    return op, length
+
+def case_decrypt_text(bits, length, mode, rng):
+    n, d, private_key = _keypair(bits, rng)
+    cipher = encrypt_text(_message(length), DEFAULT_E, n, True, mode, steps=False)[0]
+
+    def op():
+        _reset_caches()
+        decrypt_text(cipher, d, n, private_key, mode)
+    return op, length
+
+def case_pipeline(bits, length, mode, rng):
+    n, d, private_key = _keypair(bits, rng)
+    data = _message(length).encode("utf-8")
+
+    def op():
+        _reset_caches()
+        out = io.BytesIO()
+        write_container(out, encrypt_batches(iter_plain_batches([data], n, mode), DEFAULT_E, n), n, mode)
+        reader = ContainerReader([out.getvalue()])
+        text = "".join(iter_text(decrypt_batches(reader, d, n, private_key), n, mode))
+        assert len(text) == length
+    return op, length
+
+def case_batch(bits, mode, rng):
+    keys = [_keypair(bits, rng)[0] for _ in range(BATCH_KEYS)]
+    records = [{"n": keys[rng.randrange(BATCH_KEYS)], "e": DEFAULT_E, "message": _message(rng.randrange(16, 256))}
+               for _ in range(BATCH_ROWS)]
+
+    def op():
+        _reset_caches()
+        encrypt_rows(records, mode)
+    return op, BATCH_ROWS
+
+# (nama, fungsi, dimensi sweep, satuan throughput)
+CASES = [
+    ("is_prime", case_is_prime, ("bits",), "ops/s"),
+    ("is_prime[prime]", case_is_prime_prime, ("bits",), "ops/s"),
+    ("generate_prime", case_generate_prime, ("bits",), "ops/s"),
+    ("generate_random_prime", case_generate_random_prime, (), "ops/s"),
+    ("mod_exp", case_mod_exp, ("bits",), "ops/s"),
+    ("mod_inverse", case_mod_inverse, ("bits",), "ops/s"),
+    ("encrypt_text", case_encrypt_text, ("bits", "length", "mode"), "chars/s"),
+    ("decrypt_text", case_decrypt_text, ("bits", "length", "mode"), "chars/s"),
+    ("pipeline", case_pipeline, ("bits", "length", "mode"), "chars/s"),
+    ("batch", case_batch, ("bits", "mode"), "rows/s"),
+]
+
+def _param_grid(dims, args):
+    sweep = {"bits": args.bits, "length": args.lengths, "mode": args.modes}
+    grid = [{}]
+    for dim in dims:
+        grid = [dict(g, **{dim: v}) for g in grid for v in sweep[dim]]
+    return grid
+
+def result_key(name, params):
+    return name + "".join(f"[{k}={v}]" for k, v in params.items())
+
+# Ukur satu kasus: pemanasan, sampel latensi sampai repeat atau batas waktu, lalu satu run
+# terpisah di bawah tracemalloc untuk puncak memori
+def run_case(fn, params, seed, repeat, min_repeat, max_time):
+    rng = random.Random(f"{seed}:{fn.__name__}:{sorted(params.items())}")
+    op, units = fn(rng=rng, **params)
+    op()
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < repeat and (len(latencies) < min_repeat or time.perf_counter() - started < max_time):
+        t0 = time.perf_counter()
+        op()
+        latencies.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    op()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    total = sum(latencies)
+    return {
+        "samples": len(latencies),
+        "throughput": units * len(latencies) / total if total else None,
+        "mean_s": total / len(latencies),
+        "p50_s": _percentile(latencies, 0.50),
+        "p95_s": _percentile(latencies, 0.95),
+        "p99_s": _percentile(latencies, 0.99),
+        "peak_bytes": peak,
+    }
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds * 1e9:.0f}ns"
+
+def metadata(args):
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "backend": backend.get_backend().name,
+        "numpy": vector.ENABLED and vector._load_numpy() is not None,
+        "seed": args.seed,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+# Bandingkan p50 dengan baseline; kembalikan daftar (key, rasio) yang melewati ambang
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'case':<58} {'baseline p50':>13} {'p50':>10} {'change':>8}")
+    for key, result in results.items():
+        old = baseline.get("results", {}).get(key)
+        if old is None:
+            continue
+        ratio = result["p50_s"] / old["p50_s"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESI"
+            regressions.append((key, ratio))
+        elif ratio < 1 - threshold:
+            flag = "  lebih cepat"
+        print(f"{key:<58} {_format_time(old['p50_s']):>13} {_format_time(result['p50_s']):>10} "
+              f"{(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark primitif RSA dan pipeline end-to-end")
+    parser.add_argument("--bits", type=int, nargs="+", default=DEFAULT_BITS)
+    parser.add_argument("--lengths", type=int, nargs="+", default=DEFAULT_LENGTHS)
+    parser.add_argument("--modes", nargs="+", choices=["karakter", "blok"], default=["blok"])
+    parser.add_argument("--only", nargs="+", help="hanya kasus yang namanya memuat salah satu teks ini")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=50, help="sampel maksimum per kasus")
+    parser.add_argument("--min-repeat", type=int, default=5, help="sampel minimum per kasus")
+    parser.add_argument("--max-time", type=float, default=2.0, help="batas waktu pengukuran per kasus (detik)")
+    parser.add_argument("--save", help="simpan hasil sebagai JSON (baseline)")
+    parser.add_argument("--compare", help="bandingkan dengan baseline JSON; exit 1 jika ada regresi")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = {}
+    # jalur serial untuk semua ukuran input (lihat komentar di awal file)
+    min_parallel_items = parallel.MIN_PARALLEL_ITEMS
+    parallel.configure(min_parallel_items=sys.maxsize)
+    try:
+        print(f"{'case':<58} {'n':>4} {'throughput':>16} {'p50':>10} {'p95':>10} {'p99':>10} {'peak':>10}")
+        for name, fn, dims, unit in CASES:
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+            for params in _param_grid(dims, args):
+                if params.get("mode") == "blok" and params.get("bits", 16) < 16:
+                    continue
+                key = result_key(name, params)
+                result = run_case(fn, params, args.seed, args.repeat, args.min_repeat, args.max_time)
+                result.update(case=name, params=params, unit=unit)
+                results[key] = result
+                print(f"{key:<58} {result['samples']:>4} {result['throughput']:>10.1f} {unit:<5} "
+                      f"{_format_time(result['p50_s']):>10} {_format_time(result['p95_s']):>10} "
+                      f"{_format_time(result['p99_s']):>10} {result['peak_bytes'] / 1024:>8.0f}KiB", flush=True)
+    finally:
+        parallel.configure(min_parallel_items=min_parallel_items)
+
+    report = {"meta": metadata(args), "results": results}
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nHasil disimpan ke {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresi melewati ambang {args.threshold:.0%}")
+            return 1
+        print(f"\nTidak ada regresi di atas {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
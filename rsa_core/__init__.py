@@ -0,0 +1,36 @@
+from .backend import mod_exp, mod_inverse, egcd, get_backend, set_backend
+from .primality import is_prime, configure as configure_primality
+from .primegen import generate_prime, generate_primes, generate_random_prime
+from .keys import KeyPair, PrivateKey, generate_keypair, make_private_key, crt_decrypt
+from .cipher import encrypt_text, decrypt_text, encrypt_messages, decrypt_messages
+
+__all__ = [
+    "mod_exp",
+    "mod_inverse",
+    "egcd",
+    "get_backend",
+    "set_backend",
+    "is_prime",
+    "configure_primality",
+    "generate_prime",
+    "generate_primes",
+    "generate_random_prime",
+    "KeyPair",
+    "generate_keypair",
+    "PrivateKey",
+    "make_private_key",
+    "crt_decrypt",
+    "KeyPool",
+    "encrypt_text",
+    "decrypt_text",
+    "encrypt_messages",
+    "decrypt_messages",
+]
+
+# KeyPool menarik multiprocessing dan concurrent.futures; baru diimpor saat dipakai
+# agar `import rsa_core` tetap cepat untuk skrip batch dan CLI
+def __getattr__(name):
+    if name == "KeyPool":
+        from .keypool import KeyPool
+        return KeyPool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,109 @@
+import os
+from collections import namedtuple
+
+from .montgomery import FixedWindow, SlidingWindow
+
+# Backend aritmetika bilangan besar: fungsi pemangkatan modular, invers modular, dan
+# context(exp, mod) yang mengembalikan fungsi base -> base^exp mod mod dengan prakomputasi per kunci
+Backend = namedtuple("Backend", ["name", "mod_exp", "mod_inverse", "context"])
+
+# Extended Euclidean Algorithm versi iteratif (tanpa rekursi, aman untuk bilangan besar)
+def egcd(a, b):
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        k, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - k * x1
+        y0, y1 = y1, y0 - k * y1
+    return a, x0, y0
+
+# Fast modular exponentiation (square-and-multiply, referensi untuk pembelajaran)
+def _python_mod_exp(base, exp, mod):
+    result = 1
+    base = base % mod
+    while exp > 0:
+        if exp % 2 == 1:
+            result = (result * base) % mod
+        exp //= 2
+        base = (base * base) % mod
+    return result % mod
+
+def _python_mod_inverse(e, phi):
+    g, x, _ = egcd(e % phi, phi)
+    if g != 1:
+        raise ValueError('Tidak ada invers modular')
+    return x % phi
+
+def _builtin_mod_inverse(e, phi):
+    try:
+        return pow(e, -1, phi)
+    except ValueError:
+        raise ValueError('Tidak ada invers modular') from None
+
+# pow() bawaan sudah memakai jendela tetap di C; konteks hanya mengikat exp dan mod sekali
+def _builtin_context(exp, mod):
+    return lambda base: pow(base, exp, mod)
+
+BACKENDS = {
+    "python": Backend("python", _python_mod_exp, _python_mod_inverse, SlidingWindow),
+    "builtin": Backend("builtin", pow, _builtin_mod_inverse, _builtin_context),
+}
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+else:
+    def _gmpy2_mod_exp(base, exp, mod):
+        return int(gmpy2.powmod(base, exp, mod))
+
+    def _gmpy2_mod_inverse(e, phi):
+        try:
+            return int(gmpy2.invert(e, phi))
+        except ZeroDivisionError:
+            raise ValueError('Tidak ada invers modular') from None
+
+    # exp dan mod dikonversi ke mpz sekali per kunci; GMP sendiri memakai REDC dan jendela geser
+    def _gmpy2_context(exp, mod):
+        exp, mod, powmod = gmpy2.mpz(exp), gmpy2.mpz(mod), gmpy2.powmod
+        return lambda base: int(powmod(base, exp, mod))
+
+    BACKENDS["gmpy2"] = Backend("gmpy2", _gmpy2_mod_exp, _gmpy2_mod_inverse, _gmpy2_context)
+
+# Urutan preferensi: backend tercepat yang tersedia dipilih saat import
+PREFERENCE = ("gmpy2", "builtin", "python")
+
+def _default_backend():
+    requested = os.environ.get("RSA_BACKEND")
+    if requested:
+        if requested not in BACKENDS:
+            raise ValueError(f"Backend tidak tersedia: {requested} (pilihan: {', '.join(BACKENDS)})")
+        return BACKENDS[requested]
+    return next(BACKENDS[name] for name in PREFERENCE if name in BACKENDS)
+
+_active = _default_backend()
+
+def get_backend():
+    return _active
+
+def set_backend(name):
+    global _active
+    if name not in BACKENDS:
+        raise ValueError(f"Backend tidak tersedia: {name} (pilihan: {', '.join(BACKENDS)})")
+    _active = BACKENDS[name]
+    return _active
+
+# Pemangkatan modular base^exp mod mod dengan backend aktif
+def mod_exp(base, exp, mod):
+    return _active.mod_exp(base, exp, mod)
+
+# Invers modular e^-1 mod phi dengan backend aktif
+def mod_inverse(e, phi):
+    return _active.mod_inverse(e, phi)
+
+# Fungsi base -> base^exp mod mod untuk banyak nilai dengan kunci yang sama. constant_time=True
+# memakai jendela tetap Montgomery (urutan operasi tidak bergantung pada bit exp, modulus ganjil).
+def exp_context(exp, mod, constant_time=False):
+    if constant_time and mod % 2 and mod > 1:
+        return FixedWindow(exp, mod)
+    return _active.context(exp, mod)
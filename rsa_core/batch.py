@@ -0,0 +1,194 @@
+# Mode batch banyak penerima: tabel baris (kunci publik, pesan) dienkripsi dalam satu panggilan.
+# Baris dikelompokkan per kunci (n, e), sehingga cache eksponensiasi dan kernel per kunci
+# (expcache) dibangun sekali per kunci, bukan sekali per baris. Kelompok dikemas menjadi tugas
+# berukuran sekitar BATCH_SIZE nilai (kelompok besar dipecah, kelompok kecil digabung) lalu
+# dijalankan di pool worker rsa_core/parallel.py; hasil dikembalikan sesuai urutan baris input.
+#
+# Setiap baris adalah mapping (dict, baris csv.DictReader, DataFrame.to_dict("records")) dengan
+# kolom pesan ("message") dan kunci: "key_id" (dicari di penyimpanan kunci) atau "n" dan "e"
+# (default 65537). Kolom "name" opsional dipakai sebagai nama file di arsip. Baris yang tidak
+# valid tidak menghentikan batch; kesalahannya dicatat di kolom "error" baris itu.
+#
+# Modul ini tidak bergantung pada pandas: hasil berupa list dict yang bisa langsung menjadi
+# DataFrame, atau ditulis dengan write_csv / write_archive (ZIP berisi satu .rsac per baris).
+import csv
+import io
+import math
+import re
+import time
+import zipfile
+
+from . import parallel
+from .blocks import MODE_BLOK, block_size
+from .cipher import _split, message_values
+from .container import EXTENSION, key_id, write_container
+from .keys import DEFAULT_E
+from .metrics import timed
+from .stream import encrypt_batch
+
+MESSAGE_FIELD = "message"
+# Kolom hasil untuk CSV dan manifest arsip
+RESULT_FIELDS = ("row", "name", "key_id", "n", "e", "mode", "values", "cipher", "error")
+MANIFEST_NAME = "manifest.csv"
+
+_UNSAFE_NAME = re.compile(r"[^\w.-]+")
+
+def _field(record, name):
+    value = record.get(name)
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    value = str(value).strip()
+    return value or None
+
+def _int_field(record, name):
+    value = _field(record, name)
+    if value is None:
+        return None
+    try:
+        return int(value.removesuffix(".0"))
+    except ValueError:
+        raise ValueError(f"Kolom {name} bukan bilangan bulat: {value!r}") from None
+
+# Kunci publik (n, e) satu baris; key id dicari sekali per batch lewat cache `found`
+def _public_key(record, store, found):
+    kid = _field(record, "key_id")
+    if kid is not None:
+        kid = kid.lower()
+        if kid not in found:
+            if store is None:
+                raise ValueError("Kolom key_id butuh penyimpanan kunci")
+            stored = store.get(kid)
+            found[kid] = stored and (stored.keypair.n, stored.keypair.e)
+        if found[kid] is None:
+            raise ValueError(f"Kunci {kid} tidak ada di penyimpanan")
+        return found[kid]
+    n = _int_field(record, "n")
+    if n is None:
+        raise ValueError("Baris tidak memuat key_id atau n")
+    e = _int_field(record, "e") or DEFAULT_E
+    if n < 3 or not 1 < e < n:
+        raise ValueError(f"Kunci publik tidak valid (e = {e}, n = {n})")
+    return n, e
+
+def _check_message(message, n, mode):
+    if mode == MODE_BLOK:
+        if block_size(n) < 1:
+            raise ValueError(f"Modulus n = {n} terlalu kecil untuk mode blok (n harus ≥ 256)")
+    elif message and max(map(ord, message)) >= n:
+        raise ValueError(f"Ada karakter dengan kode ≥ n = {n}; pakai n lebih besar atau mode blok")
+
+# Perkiraan jumlah nilai plaintext satu pesan (untuk ukuran tugas)
+def _cost(message, n, mode):
+    if mode == MODE_BLOK:
+        return len(message) // block_size(n) + 1
+    return len(message)
+
+# Tugas worker: beberapa kelompok (e, n, pesan) -> ciphertext per pesan per kelompok.
+# Nilai satu kelompok digabung menjadi satu batch agar cache per kunci dipakai untuk semuanya.
+def encrypt_groups(groups, mode):
+    result = []
+    for e, n, messages in groups:
+        encoded = [message_values(message, n, mode) for message in messages]
+        cipher = encrypt_batch([m for values in encoded for m in values], e, n)
+        result.append(_split(cipher, map(len, encoded)))
+    return result
+
+# Kemas kelompok per kunci menjadi tugas berisi kira-kira batch_size nilai.
+# Setiap tugas: (daftar baris per kelompok, daftar (e, n, pesan) per kelompok)
+def _plan_tasks(groups, mode, batch_size):
+    tasks = []
+    rows, parts, size = [], [], 0
+    for (n, e), entries in groups.items():
+        chunk_rows, chunk = [], []
+        for row, message in entries:
+            chunk_rows.append(row)
+            chunk.append(message)
+            size += _cost(message, n, mode)
+            if size >= batch_size:
+                rows.append(chunk_rows)
+                parts.append((e, n, chunk))
+                tasks.append((rows, parts))
+                rows, parts, size = [], [], 0
+                chunk_rows, chunk = [], []
+        if chunk:
+            rows.append(chunk_rows)
+            parts.append((e, n, chunk))
+    if parts:
+        tasks.append((rows, parts))
+    return tasks
+
+# Enkripsi semua baris; mengembalikan satu dict per baris (urutan input) dengan kolom
+# RESULT_FIELDS, "cipher" berupa list bilangan (None jika baris gagal)
+@timed("encrypt_rows")
+def encrypt_rows(records, mode=MODE_BLOK, store=None, message_field=MESSAGE_FIELD, batch_size=None):
+    results = []
+    groups = {}
+    found = {}
+    total = 0
+    for row, record in enumerate(records):
+        result = {"row": row, "name": _field(record, "name") or "", "key_id": "", "n": None, "e": None,
+                  "mode": mode, "values": 0, "cipher": None, "error": None}
+        results.append(result)
+        try:
+            n, e = _public_key(record, store, found)
+            message = record.get(message_field)
+            if message is None or (isinstance(message, float) and math.isnan(message)):
+                message = ""
+            message = str(message)
+            _check_message(message, n, mode)
+        except ValueError as exc:
+            result["error"] = str(exc)
+            continue
+        result.update(key_id=key_id(n).hex(), n=n, e=e)
+        groups.setdefault((n, e), []).append((row, message))
+        total += _cost(message, n, mode)
+
+    tasks = _plan_tasks(groups, mode, batch_size or parallel.BATCH_SIZE)
+    outputs = parallel.map_ordered(encrypt_groups, ((parts, mode) for _, parts in tasks),
+                                   parallel=len(tasks) > 1 and parallel.use_parallel(total))
+    for (rows, _), ciphers in zip(tasks, outputs):
+        for group_rows, group_ciphers in zip(rows, ciphers):
+            for row, cipher in zip(group_rows, group_ciphers):
+                results[row]["cipher"] = cipher
+                results[row]["values"] = len(cipher)
+    return results
+
+# Baris hasil -> baris datar untuk CSV/DataFrame; ciphertext ditulis sebagai bilangan dipisah spasi
+def result_rows(results, cipher=True):
+    for result in results:
+        row = dict(result)
+        if cipher:
+            row["cipher"] = " ".join(map(str, result["cipher"] or ()))
+        else:
+            del row["cipher"]
+        row["error"] = result["error"] or ""
+        yield row
+
+def write_csv(results, out, cipher=True):
+    fields = [name for name in RESULT_FIELDS if cipher or name != "cipher"]
+    writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(result_rows(results, cipher))
+
+def archive_name(result):
+    stem = _UNSAFE_NAME.sub("_", result["name"].rsplit(".", 1)[0]) if result["name"] else ""
+    return f"{result['row']:05d}_{stem + '_' if stem else ''}{result['key_id']}{EXTENSION}"
+
+# Arsip ZIP: satu container .rsac per baris yang berhasil dan manifest.csv untuk semua baris
+def write_archive(results, out):
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for result in results:
+            if result["cipher"] is not None:
+                info = zipfile.ZipInfo(archive_name(result), time.localtime()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with archive.open(info, "w") as f:
+                    write_container(f, [result["cipher"]], result["n"], result["mode"])
+        manifest = io.StringIO()
+        write_csv(results, manifest, cipher=False)
+        archive.writestr(MANIFEST_NAME, manifest.getvalue())
+
+# Setiap pesan untuk setiap kunci (banyak file .txt untuk banyak penerima).
+# messages: iterable (nama, teks); keys: iterable mapping dengan key_id atau n/e
+def cross_records(messages, keys):
+    keys = list(keys)
+    return [{"name": name, MESSAGE_FIELD: text, **key} for name, text in messages for key in keys]
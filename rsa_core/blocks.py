@@ -0,0 +1,50 @@
+# Pengodean pesan ke blok bilangan bulat untuk mode blok.
+# Setiap blok berisi k byte UTF-8 (big-endian) dengan k = (bit_length(n) - 1) // 8,
+# sehingga nilainya selalu < 256^k <= n. Padding deterministik gaya ISO/IEC 7816-4:
+# tambahkan byte 0x80 lalu 0x00 sampai panjangnya kelipatan k.
+
+PAD_MARKER = 0x80
+
+# Mode enkripsi: satu eksponensiasi per karakter (untuk pembelajaran) atau per blok byte UTF-8
+MODE_KARAKTER = "karakter"
+MODE_BLOK = "blok"
+
+# Jumlah byte pesan per blok untuk modulus n (0 = mode blok tidak bisa dipakai)
+def block_size(n):
+    return max((n.bit_length() - 1) // 8, 0)
+
+def _require_block_size(n):
+    k = block_size(n)
+    if k < 1:
+        raise ValueError(f"Modulus n = {n} terlalu kecil untuk mode blok (n harus ≥ 256)")
+    return k
+
+# Tambahkan padding sehingga panjang data kelipatan k
+def pad(data, k):
+    padded = bytes(data) + bytes([PAD_MARKER])
+    return padded + bytes(-len(padded) % k)
+
+def unpad(data):
+    stripped = bytes(data).rstrip(b"\x00")
+    if not stripped or stripped[-1] != PAD_MARKER:
+        raise ValueError("Padding blok tidak valid")
+    return stripped[:-1]
+
+# Potong data (sudah dipadding, panjang kelipatan k) menjadi blok bilangan bulat
+def bytes_to_blocks(data, k):
+    view = memoryview(data)
+    return [int.from_bytes(view[i:i + k], "big") for i in range(0, len(view), k)]
+
+def blocks_to_bytes(blocks, k):
+    return b"".join(block.to_bytes(k, "big") for block in blocks)
+
+# Pesan (str atau bytes) -> daftar blok bilangan bulat < n
+def encode_blocks(message, n):
+    k = _require_block_size(n)
+    data = message.encode("utf-8") if isinstance(message, str) else message
+    return bytes_to_blocks(pad(data, k), k)
+
+# Daftar blok -> bytes asli (padding dibuang)
+def decode_blocks(blocks, n):
+    k = _require_block_size(n)
+    return unpad(blocks_to_bytes(blocks, k))
@@ -0,0 +1,176 @@
+# Enkripsi/dekripsi teks beserta data tabel langkahnya. Modul ini tidak bergantung
+# pada streamlit/pandas sehingga bisa dipakai dari CLI, skrip batch, atau aplikasi web.
+from .blocks import MODE_KARAKTER, MODE_BLOK, block_size, bytes_to_blocks, blocks_to_bytes, pad, unpad
+from .metrics import timed
+from .parallel import parallel_decrypt, parallel_encrypt
+
+# Fungsi cari gcd
+def gcd(a, b):
+    while b != 0:
+        a, b = b, a % b
+    return a
+
+# Konversi angka ke huruf A-Z (mod 26)
+def angka_ke_huruf(num):
+    return chr((num % 26) + 65)
+
+# Baris tabel langkah enkripsi untuk satu karakter atau satu blok
+def baris_enkripsi(m, cipher_num, e, n, mode=MODE_KARAKTER, nomor=None):
+    if mode == MODE_BLOK:
+        return {
+            'Blok': nomor,
+            'Teks blok': m.to_bytes(block_size(n), 'big').decode('utf-8', errors='replace'),
+            'Nilai blok (m)': m,
+            f'm^{e} mod {n}': cipher_num,
+            'Cipher Huruf': angka_ke_huruf(cipher_num)
+        }
+    ch = chr(m)
+    return {
+        'Karakter': ch if ch != ' ' else '␣',
+        'ASCII (m)': m,
+        f'm^{e} mod {n}': cipher_num,
+        'Cipher Huruf': angka_ke_huruf(cipher_num)
+    }
+
+# Baris tabel langkah dekripsi untuk satu karakter atau satu blok
+def baris_dekripsi(cipher_num, decrypted_num, d, n, mode=MODE_KARAKTER):
+    if mode == MODE_BLOK:
+        k = block_size(n)
+        return {
+            'Cipher (c)': cipher_num,
+            f'c^{d} mod {n}': decrypted_num,
+            'Byte blok (hex)': decrypted_num.to_bytes(k, 'big').hex(' ') if decrypted_num < 256**k else '-'
+        }
+    decrypted_letter = chr(decrypted_num)
+    return {
+        'Cipher (c)': cipher_num,
+        f'c^{d} mod {n}': decrypted_num,
+        'ASCII ke Karakter': decrypted_letter if decrypted_letter != ' ' else '␣'
+    }
+
+# Enkripsi teks dengan support untuk semua karakter. steps=False melewati pembuatan baris
+# tabel langkah (encryption_data kosong); baris bisa dibuat per halaman dengan langkah_enkripsi.
+@timed("encrypt_text")
+def encrypt_text(text, e, n, support_all_chars=False, mode=MODE_KARAKTER, steps=True):
+    if mode == MODE_BLOK:
+        return encrypt_text_blocks(text, e, n, steps)
+    cipher_numbers = []
+    cipher_letters = []
+    encryption_data = []
+    
+    ascii_values = [ord(ch) for ch in text]
+    for ascii_val, cipher_num in zip(ascii_values, parallel_encrypt(ascii_values, e, n)):
+        if steps:
+            encryption_data.append(baris_enkripsi(ascii_val, cipher_num, e, n))
+        
+        cipher_numbers.append(cipher_num)
+        cipher_letters.append(angka_ke_huruf(cipher_num))
+    
+    return cipher_numbers, cipher_letters, encryption_data
+
+# Dekripsi teks; jika private_key (dengan p, q, dp, dq, qinv) diberikan, pakai jalur CRT
+@timed("decrypt_text")
+def decrypt_text(cipher_numbers, d, n, private_key=None, mode=MODE_KARAKTER, steps=True):
+    if mode == MODE_BLOK:
+        return decrypt_text_blocks(cipher_numbers, d, n, private_key, steps)
+    decrypted_numbers = []
+    decrypted_letters = []
+    decryption_data = []
+    
+    for cipher_num, decrypted_num in zip(cipher_numbers, parallel_decrypt(cipher_numbers, d, n, private_key)):
+        if steps:
+            decryption_data.append(baris_dekripsi(cipher_num, decrypted_num, d, n))
+        
+        decrypted_numbers.append(decrypted_num)
+        decrypted_letters.append(chr(decrypted_num))
+    
+    return decrypted_numbers, decrypted_letters, decryption_data
+
+# Enkripsi mode blok: byte UTF-8 dikemas ke blok berukuran block_size(n) byte dengan padding
+def encrypt_text_blocks(text, e, n, steps=True):
+    k = block_size(n)
+    cipher_numbers = []
+    cipher_letters = []
+    encryption_data = []
+    
+    blocks = bytes_to_blocks(pad(text.encode('utf-8'), k), k)
+    for i, (block, cipher_num) in enumerate(zip(blocks, parallel_encrypt(blocks, e, n))):
+        if steps:
+            encryption_data.append(baris_enkripsi(block, cipher_num, e, n, MODE_BLOK, i + 1))
+        
+        cipher_numbers.append(cipher_num)
+        cipher_letters.append(angka_ke_huruf(cipher_num))
+    
+    return cipher_numbers, cipher_letters, encryption_data
+
+# Dekripsi mode blok: blok digabung kembali menjadi byte, padding dibuang, lalu didekode UTF-8
+def decrypt_text_blocks(cipher_numbers, d, n, private_key=None, steps=True):
+    k = block_size(n)
+    decrypted_numbers = []
+    decryption_data = []
+    
+    for cipher_num, decrypted_num in zip(cipher_numbers, parallel_decrypt(cipher_numbers, d, n, private_key)):
+        if steps:
+            decryption_data.append(baris_dekripsi(cipher_num, decrypted_num, d, n, MODE_BLOK))
+        
+        decrypted_numbers.append(decrypted_num)
+    
+    decrypted_letters = list(blocks_to_text(decrypted_numbers, k))
+    
+    return decrypted_numbers, decrypted_letters, decryption_data
+
+# Baris tabel langkah enkripsi hanya untuk karakter/blok ke-start sampai sebelum stop,
+# sehingga tabel pesan panjang bisa dibangun per halaman
+def langkah_enkripsi(text, cipher_numbers, e, n, mode=MODE_KARAKTER, start=0, stop=None):
+    stop = len(cipher_numbers) if stop is None else min(stop, len(cipher_numbers))
+    if mode == MODE_BLOK:
+        k = block_size(n)
+        values = bytes_to_blocks(pad(text.encode('utf-8'), k)[start * k:stop * k], k)
+    else:
+        values = [ord(ch) for ch in text[start:stop]]
+    return [baris_enkripsi(m, c, e, n, mode, start + i + 1)
+            for i, (m, c) in enumerate(zip(values, cipher_numbers[start:stop]))]
+
+def langkah_dekripsi(cipher_numbers, decrypted_numbers, d, n, mode=MODE_KARAKTER, start=0, stop=None):
+    return [baris_dekripsi(c, m, d, n, mode)
+            for c, m in zip(cipher_numbers[start:stop], decrypted_numbers[start:stop])]
+
+# Blok hasil dekripsi -> teks; jika padding tidak valid (kunci salah), byte mentah tetap ditampilkan
+def blocks_to_text(decrypted_numbers, k):
+    try:
+        data = unpad(blocks_to_bytes(decrypted_numbers, k))
+    except (ValueError, OverflowError):
+        data = b''.join(num.to_bytes((num.bit_length() + 7) // 8, 'big') for num in decrypted_numbers)
+    return data.decode('utf-8', errors='replace')
+
+# Nilai plaintext satu pesan: kode karakter, atau blok berpadding pada mode blok
+def message_values(text, n, mode=MODE_KARAKTER):
+    if mode == MODE_BLOK:
+        k = block_size(n)
+        return bytes_to_blocks(pad(text.encode('utf-8'), k), k)
+    return [ord(ch) for ch in text]
+
+def _split(values, lengths):
+    result, start = [], 0
+    for length in lengths:
+        result.append(values[start:start + length])
+        start += length
+    return result
+
+# Enkripsi banyak pesan sekaligus tanpa tabel langkah (latihan kelas massal). Nilai semua pesan
+# digabung menjadi satu batch, sehingga untuk n kecil cukup satu pass NumPy, lalu dipotong per pesan.
+@timed("encrypt_messages")
+def encrypt_messages(messages, e, n, mode=MODE_KARAKTER):
+    encoded = [message_values(text, n, mode) for text in messages]
+    cipher = parallel_encrypt([m for values in encoded for m in values], e, n)
+    return _split(cipher, map(len, encoded))
+
+# Kebalikan encrypt_messages: list ciphertext per pesan -> list teks
+@timed("decrypt_messages")
+def decrypt_messages(cipher_lists, d, n, private_key=None, mode=MODE_KARAKTER):
+    plain = parallel_decrypt([c for cipher in cipher_lists for c in cipher], d, n, private_key)
+    parts = _split(plain, map(len, cipher_lists))
+    if mode == MODE_BLOK:
+        k = block_size(n)
+        return [blocks_to_text(part, k) for part in parts]
+    return [''.join(map(chr, part)) for part in parts]
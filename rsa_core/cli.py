@@ -0,0 +1,266 @@
+# Antarmuka baris perintah untuk pekerjaan batch (cron, pipeline) tanpa server Streamlit.
+#
+#   python -m rsa_core keygen --bits 1024 --out kunci.json --public-out publik.json
+#   python -m rsa_core encrypt --key publik.json --mode blok -i pesan.txt -o pesan.rsa
+#   python -m rsa_core decrypt --key kunci.json -i pesan.rsa -o pesan.txt
+#   python -m rsa_core keygen --store kunci/ && python -m rsa_core decrypt --store kunci/ -i pesan.rsac
+#   python -m rsa_core batch -i pesan.csv -o hasil.zip
+#   python -m rsa_core batch --files surat/*.txt --key-id ID1 ID2 -o hasil.csv
+#   python -m rsa_core serve --port 8080
+#
+# Input dan output dibaca/ditulis per potongan, jadi file besar dan stdin tidak dimuat
+# seluruhnya ke memori. "-" berarti stdin/stdout.
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from contextlib import nullcontext
+from itertools import chain, islice
+
+from . import parallel
+from .blocks import MODE_BLOK, MODE_KARAKTER
+from .keys import DEFAULT_E, generate_keypair, make_private_key
+from .container import key_id, write_container
+from .stream import (
+    DEFAULT_CHUNK_SIZE, cipher_reader, decrypt_batch, encrypt_batch, iter_plain_batches,
+    iter_text, read_chunks, write_cipher_text,
+)
+
+# Format output enkripsi: teks seperti download aplikasi, satu bilangan per baris,
+# atau container biner .rsac (rsa_core/container.py)
+FORMAT_TEKS = "text"
+FORMAT_BARIS = "lines"
+FORMAT_BINER = "binary"
+
+# Isi file kunci JSON: kunci publik {n, e}, kunci privat {n, e, d, p, q}
+KEY_FIELDS = ("n", "e", "d", "p", "q")
+
+def load_key(path, *required):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    key = {name: int(data[name]) for name in KEY_FIELDS if data.get(name) is not None}
+    missing = [name for name in required if name not in key]
+    if missing:
+        raise ValueError(f"File kunci {path} tidak memuat: {', '.join(missing)}")
+    return key
+
+def open_store(path):
+    from .keystore import DEFAULT_PATH, KeyStore
+    return KeyStore(path or DEFAULT_PATH)
+
+# Kunci dari --key (file JSON) atau --key-id (penyimpanan kunci). Untuk dekripsi tanpa keduanya,
+# key id dari header ciphertext (`header_id`) dipakai untuk mencari kunci di penyimpanan.
+def resolve_key(args, *required, header_id=None):
+    if args.key:
+        return load_key(args.key, *required)
+    kid = args.key_id or header_id
+    if kid is None:
+        raise ValueError("Pakai --key FILE atau --key-id ID")
+    with open_store(args.store) as store:
+        try:
+            stored = store.load(kid)
+        except KeyError as exc:
+            raise ValueError(f"Kunci {exc.args[0]} tidak ada di penyimpanan {store.path}") from None
+    return {name: getattr(stored.keypair, name) for name in KEY_FIELDS}
+
+def save_key(path, key, fields=KEY_FIELDS):
+    with open_output(path, "w") as f:
+        json.dump({name: getattr(key, name) for name in fields}, f, indent=2)
+        f.write("\n")
+
+def open_input(path):
+    if path == "-":
+        return nullcontext(sys.stdin.buffer)
+    return open(path, "rb")
+
+def open_output(path, mode="wb"):
+    if path == "-":
+        return nullcontext(sys.stdout if "b" not in mode else sys.stdout.buffer)
+    return open(path, mode)
+
+# Mode karakter hanya bisa mengenkripsi kode karakter < n
+def check_range(batches, n):
+    for batch in batches:
+        if batch and max(batch) >= n:
+            raise ValueError(f"Karakter dengan kode {max(batch)} ≥ n = {n}; pakai n lebih besar atau --mode blok")
+        yield batch
+
+# Input satu potongan diproses serial; pool worker baru dipakai jika ada lebih dari satu batch
+def map_batches(fn, arg_tuples):
+    arg_tuples = iter(arg_tuples)
+    head = list(islice(arg_tuples, 2))
+    return parallel.map_ordered(fn, chain(head, arg_tuples), parallel=len(head) > 1)
+
+def write_lines(out, batches):
+    count = 0
+    for batch in batches:
+        if batch:
+            out.write(("\n".join(map(str, batch)) + "\n").encode())
+            count += len(batch)
+    return count
+
+def cmd_keygen(args):
+    key = generate_keypair(args.bits, args.e)
+    if args.out or args.store is None:
+        save_key(args.out or "-", key)
+    if args.public_out:
+        save_key(args.public_out, key, ("n", "e"))
+    print(f"Kunci {key.n.bit_length()} bit dibuat (e = {key.e})", file=sys.stderr)
+    if args.store is not None:
+        with open_store(args.store) as store:
+            kid = store.save(key, label=args.label or "", sync=True)
+        print(f"Disimpan di {args.store}, key id {kid}", file=sys.stderr)
+
+def cmd_encrypt(args):
+    key = resolve_key(args, "n", "e")
+    e, n = key["e"], key["n"]
+    mode = args.mode or MODE_KARAKTER
+    with open_input(args.input) as src, open_output(args.output) as out:
+        batches = iter_plain_batches(read_chunks(src, args.chunk_size), n, mode)
+        if mode == MODE_KARAKTER:
+            batches = check_range(batches, n)
+        cipher = map_batches(encrypt_batch, ((batch, e, n) for batch in batches))
+        if args.format == FORMAT_TEKS:
+            count = write_cipher_text(out, cipher, e, n, mode)
+        elif args.format == FORMAT_BINER:
+            count = write_container(out, cipher, n, mode)
+        else:
+            count = write_lines(out, cipher)
+    print(f"{count} nilai dienkripsi (mode {mode})", file=sys.stderr)
+
+def cmd_decrypt(args):
+    with open_input(args.input) as src, open_output(args.output) as out:
+        reader = cipher_reader(read_chunks(src, args.chunk_size))
+        key = resolve_key(args, "n", "d", header_id=reader_key_id(reader))
+        d, n = key["d"], key["n"]
+        private_key = make_private_key(key["p"], key["q"], d) if "p" in key and "q" in key else None
+        reader.check_key(n)
+        mode = args.mode or reader.mode or MODE_KARAKTER
+        plain = map_batches(decrypt_batch, ((batch, d, n, private_key) for batch in reader))
+        for text in iter_text(plain, n, mode):
+            out.write(text.encode("utf-8", errors="replace"))
+
+# Banyak (kunci, pesan) sekaligus: CSV berisi kolom pesan dan key_id atau n/e, atau setiap
+# --files untuk setiap --key-id. Output .zip = satu .rsac per baris + manifest, selain itu CSV.
+def cmd_batch(args):
+    from .batch import MESSAGE_FIELD, cross_records, encrypt_rows, write_archive, write_csv
+    message_field = args.message_column or MESSAGE_FIELD
+    if args.files:
+        if not args.key_id:
+            raise ValueError("--files membutuhkan --key-id")
+        messages = []
+        for path in args.files:
+            with open(path, encoding="utf-8") as f:
+                messages.append((os.path.basename(path), f.read()))
+        records = cross_records(messages, [{"key_id": kid} for kid in args.key_id])
+        message_field = MESSAGE_FIELD
+    elif args.input:
+        with open_input(args.input) as src:
+            records = list(csv.DictReader(io.TextIOWrapper(src, encoding="utf-8", newline="")))
+        if records and message_field not in records[0]:
+            raise ValueError(f"CSV tidak memuat kolom {message_field}")
+    else:
+        raise ValueError("Pakai -i FILE.csv atau --files FILE... --key-id ID...")
+    with (open_store(args.store) if any(record.get("key_id") for record in records) else nullcontext()) as store:
+        results = encrypt_rows(records, args.mode, store, message_field)
+    if args.output.endswith(".zip"):
+        with open(args.output, "wb") as out:
+            write_archive(results, out)
+    else:
+        with open_output(args.output, "w") as out:
+            write_csv(results, out)
+    failed = [result for result in results if result["error"]]
+    print(f"{len(results) - len(failed)} baris dienkripsi, {len(failed)} gagal", file=sys.stderr)
+    for result in failed[:10]:
+        print(f"  baris {result['row']}: {result['error']}", file=sys.stderr)
+    if failed:
+        raise ValueError(f"{len(failed)} baris gagal; lihat kolom error di output")
+
+# Key id ciphertext: dari header container .rsac, atau dari n di header teks (kunci publik)
+def reader_key_id(reader):
+    public_key = getattr(reader, "public_key", None)
+    if public_key:
+        return key_id(public_key[1])
+    return getattr(reader, "key_id", None)
+
+# Modul server (asyncio) dan KeyPool baru diimpor jika subperintah serve dipakai
+def cmd_serve(args):
+    from .server import run
+    key_pool = None
+    if args.key_pool:
+        from .keypool import KeyPool
+        key_pool = KeyPool(target=args.key_pool)
+    options = {"host": args.host, "port": args.port, "max_values": args.batch_max}
+    if args.batch_delay is not None:
+        options["delay"] = args.batch_delay / 1000
+    run(key_pool=key_pool, **{name: value for name, value in options.items() if value is not None})
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m rsa_core", description="Enkripsi/dekripsi RSA batch")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    keygen = sub.add_parser("keygen", help="buat pasangan kunci baru")
+    keygen.add_argument("--bits", type=int, default=1024, help="ukuran modulus n (default 1024)")
+    keygen.add_argument("-e", type=int, default=DEFAULT_E, help=f"eksponen publik (default {DEFAULT_E})")
+    keygen.add_argument("--out", help="file kunci privat JSON (default stdout, kecuali dengan --store)")
+    keygen.add_argument("--public-out", help="file kunci publik JSON (hanya n dan e)")
+    keygen.add_argument("--store", help="simpan juga ke penyimpanan kunci di direktori ini")
+    keygen.add_argument("--label", help="label kunci di penyimpanan")
+    keygen.set_defaults(func=cmd_keygen)
+
+    for name, func, help in (("encrypt", cmd_encrypt, "enkripsi file/stdin"),
+                             ("decrypt", cmd_decrypt, "dekripsi file/stdin")):
+        cmd = sub.add_parser(name, help=help)
+        cmd.add_argument("--key", help="file kunci JSON")
+        cmd.add_argument("--key-id", help="id kunci di penyimpanan (16 digit hex)")
+        cmd.add_argument("--store", help="direktori penyimpanan kunci (default RSA_KEYSTORE / rsa_keystore)")
+        cmd.add_argument("-i", "--input", default="-", help="file input (default stdin)")
+        cmd.add_argument("-o", "--output", default="-", help="file output (default stdout)")
+        cmd.add_argument("--mode", choices=[MODE_KARAKTER, MODE_BLOK],
+                         help="mode enkripsi (default karakter; dekripsi memakai mode dari header)")
+        cmd.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="ukuran potongan baca (byte)")
+        cmd.add_argument("--workers", type=int, help="jumlah worker paralel (default RSA_WORKERS / jumlah CPU)")
+        if name == "encrypt":
+            cmd.add_argument("--format", choices=[FORMAT_TEKS, FORMAT_BARIS, FORMAT_BINER], default=FORMAT_TEKS,
+                             help="text = format download aplikasi, lines = satu bilangan per baris, "
+                                  "binary = container biner .rsac")
+        cmd.set_defaults(func=func)
+
+    batch = sub.add_parser("batch", help="enkripsi banyak pesan untuk banyak kunci sekaligus")
+    batch.add_argument("-i", "--input", help="CSV dengan kolom message dan key_id atau n (+ e); \"-\" = stdin")
+    batch.add_argument("--files", nargs="+", help="file teks; setiap file dienkripsi untuk setiap --key-id")
+    batch.add_argument("--key-id", nargs="+", help="id kunci penerima di penyimpanan (untuk --files)")
+    batch.add_argument("--store", help="direktori penyimpanan kunci (default RSA_KEYSTORE / rsa_keystore)")
+    batch.add_argument("-o", "--output", default="-",
+                       help="file .zip (satu .rsac per baris + manifest.csv) atau CSV (default stdout)")
+    batch.add_argument("--mode", choices=[MODE_KARAKTER, MODE_BLOK], default=MODE_BLOK,
+                       help="mode enkripsi (default blok)")
+    batch.add_argument("--message-column", help="nama kolom pesan di CSV (default message)")
+    batch.add_argument("--workers", type=int, help="jumlah worker paralel (default RSA_WORKERS / jumlah CPU)")
+    batch.set_defaults(func=cmd_batch)
+
+    serve = sub.add_parser("serve", help="jalankan layanan HTTP keygen/encrypt/decrypt")
+    serve.add_argument("--host", help="alamat bind (default 127.0.0.1)")
+    serve.add_argument("--port", type=int, help="port (default 8080)")
+    serve.add_argument("--batch-delay", type=float, help="waktu kumpul micro-batch dalam ms (default 2)")
+    serve.add_argument("--batch-max", type=int, help="jumlah nilai maksimum per micro-batch (default 4096)")
+    serve.add_argument("--key-pool", type=int, default=0,
+                       help="jumlah kunci siap pakai per ukuran untuk /keygen (0 = tanpa pool)")
+    serve.add_argument("--workers", type=int, help="jumlah worker pemangkatan (default RSA_WORKERS / jumlah CPU)")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "workers", None):
+        parallel.configure(workers=args.workers)
+    try:
+        args.func(args)
+    except (OSError, ValueError) as exc:
+        parser.exit(1, f"{parser.prog}: error: {exc}\n")
+    finally:
+        parallel.shutdown()
+    return 0
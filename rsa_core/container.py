@@ -0,0 +1,118 @@
+# Format biner ringkas untuk ciphertext (.rsac). Header 20 byte berisi:
+#
+#   magic "RSAC" | versi (u8) | mode (u8: 0 karakter, 1 blok) | lebar nilai (u16, byte)
+#   | ukuran modulus (u32, bit) | key id (8 byte, SHA-256 dari n)
+#
+# lalu nilai ciphertext berurutan, masing-masing `lebar` byte big-endian. Jumlah nilai =
+# panjang body / lebar, jadi file bisa ditulis secara streaming. Untuk lebar <= 8 byte
+# (dibulatkan ke 1, 2, 4, atau 8) konversi dilakukan lewat `array` tanpa objek per elemen.
+import struct
+import sys
+from array import array
+
+from .blocks import MODE_BLOK, MODE_KARAKTER
+
+MAGIC = b"RSAC"
+VERSION = 1
+HEADER = struct.Struct(">4sBBHI8s")
+EXTENSION = ".rsac"
+
+_MODE_CODES = {MODE_KARAKTER: 0, MODE_BLOK: 1}
+_MODE_NAMES = {code: mode for mode, code in _MODE_CODES.items()}
+# Kode tipe array per lebar byte (ukuran item tergantung platform, jadi dicari saat import)
+_ARRAY_TYPES = {}
+for _code in "BHILQ":
+    _ARRAY_TYPES.setdefault(array(_code).itemsize, _code)
+
+# Sidik jari modulus n: 8 byte pertama SHA-256 dari n (big-endian)
+def key_id(n):
+    import hashlib
+    return hashlib.sha256(n.to_bytes((n.bit_length() + 7) // 8, "big")).digest()[:8]
+
+# Lebar tiap nilai ciphertext (byte) untuk modulus n
+def value_width(n):
+    width = (n.bit_length() + 7) // 8
+    if width <= 8:
+        return min(size for size in _ARRAY_TYPES if size >= width)
+    return width
+
+def is_container(data):
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+def pack_header(n, mode):
+    return HEADER.pack(MAGIC, VERSION, _MODE_CODES[mode], value_width(n), n.bit_length(), key_id(n))
+
+# Batch bilangan -> byte big-endian dengan lebar tetap
+def pack_values(values, width):
+    typecode = _ARRAY_TYPES.get(width)
+    if typecode is not None:
+        packed = array(typecode, values)
+        if sys.byteorder == "little":
+            packed.byteswap()
+        return packed.tobytes()
+    return b"".join([value.to_bytes(width, "big") for value in values])
+
+# Byte big-endian (panjang kelipatan width) -> list bilangan, dibaca lewat memoryview tanpa salinan
+def unpack_values(data, width):
+    typecode = _ARRAY_TYPES.get(width)
+    if typecode is not None:
+        values = array(typecode)
+        values.frombytes(data)
+        if sys.byteorder == "little":
+            values.byteswap()
+        return values.tolist()
+    view = memoryview(data)
+    return [int.from_bytes(view[i:i + width], "big") for i in range(0, len(view), width)]
+
+# Tulis header lalu setiap batch ciphertext ke file biner `out`; mengembalikan jumlah nilai
+def write_container(out, batches, n, mode):
+    width = value_width(n)
+    out.write(pack_header(n, mode))
+    count = 0
+    for batch in batches:
+        out.write(pack_values(batch, width))
+        count += len(batch)
+    return count
+
+# Baca container per potongan. Header dibaca di __init__ (atribut mode, width, n_bits, key_id),
+# iterasi menghasilkan satu batch nilai per potongan; nilai yang terpotong disambung ke potongan berikutnya.
+class ContainerReader:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        buffer = b""
+        while len(buffer) < HEADER.size:
+            chunk = next(self._chunks, b"")
+            if not chunk:
+                raise ValueError("File ciphertext biner terpotong: header tidak lengkap")
+            buffer += chunk
+        magic, version, mode, self.width, self.n_bits, self.key_id = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Bukan file ciphertext biner (magic RSAC tidak ditemukan)")
+        if version != VERSION:
+            raise ValueError(f"Versi format {version} tidak didukung (didukung: {VERSION})")
+        if mode not in _MODE_NAMES or not self.width:
+            raise ValueError("Header ciphertext biner tidak valid")
+        self.version = version
+        self.mode = _MODE_NAMES[mode]
+        self._buffer = buffer[HEADER.size:]
+
+    # Pastikan container dibuat untuk modulus n
+    def check_key(self, n):
+        if self.key_id != key_id(n):
+            raise ValueError(f"Ciphertext dibuat untuk kunci lain (modulus {self.n_bits} bit, "
+                             f"key id {self.key_id.hex()}), bukan n ini")
+
+    def __iter__(self):
+        carry = self._buffer
+        for chunk in self._chunks:
+            data = carry + chunk if carry else chunk
+            usable = len(data) - len(data) % self.width
+            if usable:
+                yield unpack_values(memoryview(data)[:usable], self.width)
+            carry = data[usable:]
+        if len(carry) >= self.width:
+            usable = len(carry) - len(carry) % self.width
+            yield unpack_values(memoryview(carry)[:usable], self.width)
+            carry = carry[usable:]
+        if carry:
+            raise ValueError(f"File ciphertext biner terpotong: {len(carry)} byte sisa")
@@ -0,0 +1,160 @@
+# Cache hasil pemangkatan modular per kunci (exp, n). Untuk n kecil seluruh tabel
+# m -> m^exp mod n dihitung sekali; untuk n besar dipakai LRU berukuran terbatas.
+# Cache bersifat global per proses sehingga tetap berlaku di antara rerun Streamlit.
+# Nilai yang belum ada di cache dihitung lewat konteks pemangkatan per kunci (backend.exp_context /
+# keys.crt_context) yang dibuat sekali per kunci, bukan mod_exp dari nol untuk setiap nilai.
+import os
+import threading
+from collections import OrderedDict
+
+from . import backend, vector
+from .keys import crt_context
+
+ENABLED = True
+# RSA_CONSTANT_TIME=1: dekripsi memakai jendela tetap Montgomery (tanpa jalur NumPy yang
+# bercabang per bit eksponen). Lebih lambat; hanya urutan operasi yang dibuat tetap.
+CONSTANT_TIME = os.environ.get("RSA_CONSTANT_TIME", "0") == "1"
+# n <= batas ini memakai tabel lengkap
+FULL_TABLE_LIMIT = 1 << 14
+# Jumlah entri LRU per kunci
+CACHE_SIZE = 4096
+# Jumlah kunci (exp, n) yang cache-nya disimpan
+MAX_KEYS = 16
+
+class ExpCache:
+    def __init__(self, exp, n, private_key=None, maxsize=CACHE_SIZE, full_table_limit=FULL_TABLE_LIMIT,
+                 constant_time=False):
+        self.exp = exp
+        self.n = n
+        self.private_key = private_key
+        self.constant_time = constant_time
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.vectorized = 0
+        self._lock = threading.Lock()
+        self._memo = OrderedDict()
+        self._table = None
+        self._kernel = None
+        self._kernel_backend = None
+        if n <= full_table_limit:
+            self._table = self._vector(range(n)) or list(map(self._compute(), range(n)))
+            self.misses = n
+
+    # Konteks pemangkatan untuk kunci ini; dibuat ulang jika backend aktif berganti
+    def _compute(self):
+        active = backend.get_backend()
+        if self._kernel_backend is not active:
+            if self.private_key is not None:
+                self._kernel = crt_context(self.private_key, self.constant_time)
+            else:
+                self._kernel = backend.exp_context(self.exp, self.n, self.constant_time)
+            self._kernel_backend = active
+        return self._kernel
+
+    def _vector(self, values):
+        if self.constant_time:
+            return None
+        return _vector_mod_exp(values, self.exp, self.n)
+
+    @property
+    def full_table(self):
+        return self._table is not None
+
+    # Hitung m^exp mod n untuk setiap nilai dalam batch, memakai cache jika ada
+    def map(self, values):
+        if self._table is not None:
+            table, n = self._table, self.n
+            result = [table[m % n] for m in values]
+            with self._lock:
+                self.hits += len(result)
+            return result
+        # n² muat di uint64: satu pemangkatan array lebih cepat daripada LRU per nilai
+        result = self._vector(values)
+        if result is not None:
+            with self._lock:
+                self.vectorized += len(result)
+            return result
+        compute = self._compute()
+        result = []
+        with self._lock:
+            memo = self._memo
+            for m in values:
+                c = memo.get(m)
+                if c is None:
+                    c = compute(m)
+                    memo[m] = c
+                    self.misses += 1
+                    if len(memo) > self.maxsize:
+                        memo.popitem(last=False)
+                else:
+                    memo.move_to_end(m)
+                    self.hits += 1
+                result.append(c)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "vectorized": self.vectorized,
+                "size": len(self._table) if self._table is not None else len(self._memo),
+                "full_table": self._table is not None,
+            }
+
+# Jalur NumPy (rsa_core.vector) jika modulus dan ukuran batch memenuhi syarat, selain itu None.
+# Dengan kunci privat hasilnya sama dengan c^d mod n, jadi CRT tidak diperlukan di jalur ini.
+def _vector_mod_exp(values, exp, n):
+    if not vector.use_vector(n, len(values)):
+        return None
+    try:
+        return vector.mod_exp(values, exp, n)
+    except OverflowError:
+        return None
+
+_caches = OrderedDict()
+_caches_lock = threading.Lock()
+
+# Ambil (atau buat) cache untuk kunci (exp, n). secret=True menandai eksponen privat (dekripsi)
+def get_cache(exp, n, private_key=None, secret=False):
+    key = (exp, n)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is not None:
+            _caches.move_to_end(key)
+            return cache
+    cache = ExpCache(exp, n, private_key, constant_time=secret and CONSTANT_TIME)
+    with _caches_lock:
+        cache = _caches.setdefault(key, cache)
+        _caches.move_to_end(key)
+        while len(_caches) > MAX_KEYS:
+            _caches.popitem(last=False)
+    return cache
+
+# Pemangkatan modular untuk satu batch; lewat cache kecuali dinonaktifkan
+def cached_mod_exp(values, exp, n, private_key=None, secret=False):
+    if not ENABLED:
+        constant_time = secret and CONSTANT_TIME
+        if not constant_time:
+            result = _vector_mod_exp(values, exp, n)
+            if result is not None:
+                return result
+        if private_key is not None:
+            return list(map(crt_context(private_key, constant_time), values))
+        return list(map(backend.exp_context(exp, n, constant_time), values))
+    return get_cache(exp, n, private_key, secret).map(values)
+
+def cache_stats(exp, n):
+    with _caches_lock:
+        cache = _caches.get((exp, n))
+    return cache.stats() if cache is not None else None
+
+# Buang cache untuk kunci tertentu (misalnya saat p, q, atau e berubah)
+def invalidate(exp, n):
+    with _caches_lock:
+        _caches.pop((exp, n), None)
+
+def clear():
+    with _caches_lock:
+        _caches.clear()
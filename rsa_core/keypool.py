@@ -0,0 +1,114 @@
+import multiprocessing
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .keys import DEFAULT_E, generate_keypair
+
+# Jumlah kunci siap pakai per ukuran bit, dan ambang isi ulang
+DEFAULT_TARGET = 4
+# Jumlah sampel latensi isi ulang yang disimpan per ukuran bit
+LATENCY_SAMPLES = 100
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+# Pool kunci yang diisi di latar belakang oleh ProcessPoolExecutor.
+# get() langsung mengembalikan kunci yang sudah siap; jika pool kosong,
+# pemanggil menunggu satu kunci dari worker tanpa memblokir sesi lain.
+class KeyPool:
+    def __init__(self, target=DEFAULT_TARGET, low_water=None, max_workers=None, e=DEFAULT_E):
+        self.target = target
+        self.low_water = max(1, target // 2) if low_water is None else low_water
+        self.e = e
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self._lock = threading.Lock()
+        self._ready = defaultdict(deque)
+        self._pending = defaultdict(int)
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._latencies = defaultdict(lambda: deque(maxlen=LATENCY_SAMPLES))
+        self._closed = False
+
+    # Ambil satu pasangan kunci `bits` bit
+    def get(self, bits, timeout=None):
+        with self._lock:
+            ready = self._ready[bits]
+            key = ready.popleft() if ready else None
+            if key is not None:
+                self._hits[bits] += 1
+            else:
+                self._misses[bits] += 1
+        if key is None:
+            started = time.perf_counter()
+            key = self._executor.submit(generate_keypair, bits, self.e).result(timeout)
+            self._record_latency(bits, time.perf_counter() - started)
+        self.refill(bits)
+        return key
+
+    # Isi ulang pool sampai target jika jumlah kunci (siap + sedang dibuat) di bawah ambang
+    def refill(self, bits, force=False):
+        with self._lock:
+            if self._closed:
+                return 0
+            depth = len(self._ready[bits]) + self._pending[bits]
+            if not force and depth >= self.low_water:
+                return 0
+            need = self.target - depth
+            self._pending[bits] += max(need, 0)
+        for _ in range(need):
+            future = self._executor.submit(generate_keypair, bits, self.e)
+            future.add_done_callback(self._make_callback(bits, time.perf_counter()))
+        return max(need, 0)
+
+    # Isi pool sampai penuh tanpa menunggu ambang
+    def prefill(self, bits):
+        return self.refill(bits, force=True)
+
+    def _make_callback(self, bits, submitted):
+        def done(future):
+            with self._lock:
+                self._pending[bits] -= 1
+            if future.cancelled() or future.exception() is not None:
+                with self._lock:
+                    self._errors[bits] += 1
+                return
+            self._record_latency(bits, time.perf_counter() - submitted)
+            with self._lock:
+                self._ready[bits].append(future.result())
+        return done
+
+    def _record_latency(self, bits, seconds):
+        with self._lock:
+            self._latencies[bits].append(seconds)
+
+    # Metrik per ukuran bit: kedalaman pool, kunci yang sedang dibuat, hit/miss, latensi isi ulang
+    def stats(self):
+        with self._lock:
+            sizes = sorted(set(self._ready) | set(self._pending) | set(self._latencies))
+            result = {}
+            for bits in sizes:
+                latencies = list(self._latencies[bits])
+                result[bits] = {
+                    "depth": len(self._ready[bits]),
+                    "pending": self._pending[bits],
+                    "target": self.target,
+                    "hits": self._hits[bits],
+                    "misses": self._misses[bits],
+                    "errors": self._errors[bits],
+                    "refill_last_s": latencies[-1] if latencies else None,
+                    "refill_avg_s": sum(latencies) / len(latencies) if latencies else None,
+                    "refill_p95_s": _percentile(latencies, 0.95),
+                }
+            return result
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,61 @@
+import math
+from collections import namedtuple
+
+from . import backend
+from .primegen import generate_prime
+
+# Eksponen publik standar
+DEFAULT_E = 65537
+
+# Pasangan kunci RSA lengkap: modulus n = p * q, kunci publik (e, n), kunci privat (d, n)
+KeyPair = namedtuple("KeyPair", ["p", "q", "n", "e", "d"])
+
+# Buat pasangan kunci dengan modulus tepat `bits` bit
+def generate_keypair(bits, e=DEFAULT_E):
+    if bits < 8:
+        raise ValueError("Ukuran modulus minimal 8 bit")
+    half = bits // 2
+    while True:
+        p = generate_prime(bits - half)
+        q = generate_prime(half)
+        # prima kecil (di bawah MIN_SIEVE_BITS) tidak dijamin dua bit teratasnya diset
+        if p == q or (p * q).bit_length() != bits:
+            continue
+        phi = (p - 1) * (q - 1)
+        if math.gcd(e, phi) == 1:
+            break
+    return KeyPair(p, q, p * q, e, backend.mod_inverse(e, phi))
+
+# Kunci privat dengan komponen CRT yang sudah dihitung di muka:
+# dp = d mod (p-1), dq = d mod (q-1), qinv = q^-1 mod p
+PrivateKey = namedtuple("PrivateKey", ["n", "d", "p", "q", "dp", "dq", "qinv"])
+
+# Untuk p atau q = 2, dp/dq = d mod 1 = 0 dan CRT salah untuk ciphertext genap; kembalikan None
+# agar pemanggil memakai pemangkatan mod n biasa
+def make_private_key(p, q, d):
+    if min(p, q) == 2:
+        return None
+    return PrivateKey(p * q, d, p, q, d % (p - 1), d % (q - 1), backend.mod_inverse(q, p))
+
+# Dekripsi satu blok dengan CRT + rekombinasi Garner; hasilnya sama dengan pow(c, d, n)
+def crt_decrypt(c, key):
+    if min(key.p, key.q) == 2:
+        return backend.mod_exp(c, key.d, key.n)
+    m1 = backend.mod_exp(c, key.dp, key.p)
+    m2 = backend.mod_exp(c, key.dq, key.q)
+    h = key.qinv * (m1 - m2) % key.p
+    return m2 + h * key.q
+
+# Versi crt_decrypt untuk banyak ciphertext dengan kunci yang sama: konteks pemangkatan mod p
+# dan mod q (serta p, q, qinv) disiapkan sekali
+def crt_context(key, constant_time=False):
+    if min(key.p, key.q) == 2:
+        return backend.exp_context(key.d, key.n, constant_time)
+    exp_p = backend.exp_context(key.dp, key.p, constant_time)
+    exp_q = backend.exp_context(key.dq, key.q, constant_time)
+    p, q, qinv = key.p, key.q, key.qinv
+
+    def decrypt(c):
+        m2 = exp_q(c)
+        return m2 + qinv * (exp_p(c) - m2) % p * q
+    return decrypt
@@ -0,0 +1,372 @@
+# Penyimpanan kunci lokal yang persisten. Satu direktori berisi dua file:
+#
+#   keys.dat  append-only; setiap record = magic "RSAK" | panjang payload (u32) | crc32 (u32)
+#             | payload (waktu dibuat f64, label, lalu n, e, d, p, q, dp, dq, qinv dengan prefiks panjang)
+#   keys.idx  tabel hash open addressing di-mmap: header (magic "RSKI", versi, jumlah slot, jumlah
+#             kunci, panjang keys.dat yang sudah terindeks) lalu slot (key id 8 byte, offset, panjang)
+#
+# Key id = 8 byte pertama SHA-256(n), sama dengan key id di header container .rsac, sehingga kunci
+# untuk sebuah file .rsac bisa langsung dicari. Memuat satu kunci = satu probe di mmap + satu
+# pembacaan record, tanpa mem-parse seluruh file. Jika keys.idx hilang atau rusak, indeks dibangun
+# ulang dari keys.dat; record yang tertulis tetapi belum terindeks (proses mati di tengah) ikut dipulihkan.
+# Record rusak di tengah file dilewati (dicari magic record berikutnya); hanya ekor file tanpa record
+# valid setelahnya (penulisan terpotong) yang dibuang.
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+from contextlib import contextmanager
+
+from .container import key_id
+from . import backend
+from .keys import KeyPair, PrivateKey
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_PATH = os.environ.get("RSA_KEYSTORE", "rsa_keystore")
+DATA_FILE = "keys.dat"
+INDEX_FILE = "keys.idx"
+
+RECORD_MAGIC = b"RSAK"
+RECORD_HEADER = struct.Struct(">4sII")
+INDEX_MAGIC = b"RSKI"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct(">4sB3xQQQ")
+SLOT = struct.Struct(">8sQI")
+# Jumlah slot awal (pangkat dua); indeks digandakan jika terisi lebih dari MAX_LOAD
+INITIAL_SLOTS = 1024
+MAX_LOAD = 0.5
+
+_META = struct.Struct(">dH")
+_LENGTH = struct.Struct(">I")
+_INT_FIELDS = ("n", "e", "d", "p", "q", "dp", "dq", "qinv")
+
+# Kunci yang dimuat: id (hex), KeyPair, PrivateKey (komponen CRT), label, waktu dibuat (epoch)
+StoredKey = namedtuple("StoredKey", ["id", "keypair", "private_key", "label", "created"])
+
+def _encode(keypair, label, created):
+    label = label.encode("utf-8")
+    if len(label) > 0xFFFF:
+        raise ValueError("Label kunci terlalu panjang (maksimal 65535 byte)")
+    parts = [_META.pack(created, len(label)), label]
+    p, q, d = keypair.p, keypair.q, keypair.d
+    values = (keypair.n, keypair.e, d, p, q, d % (p - 1), d % (q - 1), backend.mod_inverse(q, p))
+    for value in values:
+        raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+        parts += [_LENGTH.pack(len(raw)), raw]
+    return b"".join(parts)
+
+# n adalah bilangan pertama setelah label
+def _record_n(payload):
+    pos = _META.size + _META.unpack_from(payload)[1]
+    (length,) = _LENGTH.unpack_from(payload, pos)
+    pos += _LENGTH.size
+    return int.from_bytes(payload[pos:pos + length], "big")
+
+def _decode(kid, payload):
+    created, label_length = _META.unpack_from(payload)
+    pos = _META.size
+    label = payload[pos:pos + label_length].decode("utf-8")
+    pos += label_length
+    values = {}
+    for name in _INT_FIELDS:
+        (length,) = _LENGTH.unpack_from(payload, pos)
+        pos += _LENGTH.size
+        values[name] = int.from_bytes(payload[pos:pos + length], "big")
+        pos += length
+    keypair = KeyPair(values["p"], values["q"], values["n"], values["e"], values["d"])
+    # komponen CRT dari record; tanpa CRT jika p atau q = 2 (lihat keys.make_private_key)
+    private_key = None
+    if min(keypair.p, keypair.q) != 2:
+        private_key = PrivateKey(*(values[name] for name in ("n", "d", "p", "q", "dp", "dq", "qinv")))
+    return StoredKey(kid.hex(), keypair, private_key, label, created)
+
+def _parse_id(value):
+    if isinstance(value, (bytes, bytearray)):
+        kid = bytes(value)
+    else:
+        try:
+            kid = bytes.fromhex(value.strip())
+        except ValueError:
+            kid = b""
+    if len(kid) != 8:
+        raise ValueError(f"Key id harus 16 digit hex, bukan {value!r}")
+    return kid
+
+class KeyStore:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._data = open(os.path.join(path, DATA_FILE), "a+b")
+        self._index_path = os.path.join(path, INDEX_FILE)
+        self._index_file = None
+        self._index = None
+        self._index_stat = None
+        with self._lock, self._file_lock():
+            self._open_index()
+            self._catch_up()
+
+    # Kunci antar-proses (app dan skrip batch bisa menulis ke store yang sama). Boleh dipanggil
+    # bertingkat: flock hanya diambil di tingkat terluar dan dilepas saat tingkat itu selesai.
+    # Selalu dipanggil sambil memegang self._lock, jadi penghitung tingkat aman antar-thread.
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        if not self._lock_depth:
+            fcntl.flock(self._data.fileno(), fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if not self._lock_depth:
+                fcntl.flock(self._data.fileno(), fcntl.LOCK_UN)
+
+    def _open_index(self):
+        self._unmap()
+        try:
+            self._map_index()
+        except (OSError, ValueError, struct.error):
+            with self._file_lock():
+                self._rebuild()
+
+    def _map_index(self):
+        index_file = open(self._index_path, "r+b")
+        try:
+            index = mmap.mmap(index_file.fileno(), 0)
+        except ValueError:
+            index_file.close()
+            raise
+        magic, version, slots, _, _ = INDEX_HEADER.unpack_from(index)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or slots & (slots - 1) or \
+                len(index) != INDEX_HEADER.size + slots * SLOT.size:
+            index.close()
+            index_file.close()
+            raise ValueError("Indeks kunci rusak")
+        self._index_file, self._index = index_file, index
+        self._index_stat = os.fstat(index_file.fileno())
+
+    def _unmap(self):
+        if self._index is not None:
+            self._index.close()
+            self._index_file.close()
+        self._index = self._index_file = None
+
+    # Proses lain mungkin sudah mengganti file indeks (setelah membesar); petakan ulang jika berubah
+    def _refresh(self):
+        try:
+            stat = os.stat(self._index_path)
+        except OSError:
+            stat = None
+        if stat is None or (stat.st_ino, stat.st_size) != (self._index_stat.st_ino, self._index_stat.st_size):
+            self._open_index()
+
+    def _header(self):
+        _, _, slots, count, indexed = INDEX_HEADER.unpack_from(self._index)
+        return slots, count, indexed
+
+    def _write_header(self, index, slots, count, indexed):
+        INDEX_HEADER.pack_into(index, 0, INDEX_MAGIC, INDEX_VERSION, slots, count, indexed)
+
+    # Slot untuk kid: (posisi byte, offset, panjang); panjang 0 berarti slot kosong
+    def _probe(self, index, slots, kid):
+        mask = slots - 1
+        slot = int.from_bytes(kid, "big") & mask
+        while True:
+            pos = INDEX_HEADER.size + slot * SLOT.size
+            found, offset, length = SLOT.unpack_from(index, pos)
+            if not length or found == kid:
+                return pos, offset, length
+            slot = (slot + 1) & mask
+
+    def _insert(self, index, slots, kid, offset, length):
+        pos, _, existing = self._probe(index, slots, kid)
+        if existing:
+            return False
+        SLOT.pack_into(index, pos, kid, offset, length)
+        return True
+
+    # Buat file indeks baru berukuran `slots` berisi entri `entries`, lalu ganti file lama secara atomik
+    def _write_index(self, slots, entries, indexed):
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w+b") as f:
+            f.truncate(INDEX_HEADER.size + slots * SLOT.size)
+            with mmap.mmap(f.fileno(), 0) as index:
+                count = sum(self._insert(index, slots, kid, offset, length) for kid, offset, length in entries)
+                self._write_header(index, slots, count, indexed)
+                index.flush()
+        self._unmap()
+        os.replace(tmp_path, self._index_path)
+        self._map_index()
+
+    def _entries(self):
+        slots = self._header()[0]
+        for slot in range(slots):
+            kid, offset, length = SLOT.unpack_from(self._index, INDEX_HEADER.size + slot * SLOT.size)
+            if length:
+                yield kid, offset, length
+
+    # Baca record di offset; None jika terpotong atau checksum salah
+    def _read_record(self, offset):
+        self._data.seek(offset)
+        head = self._data.read(RECORD_HEADER.size)
+        if len(head) < RECORD_HEADER.size:
+            return None
+        magic, length, checksum = RECORD_HEADER.unpack(head)
+        if magic != RECORD_MAGIC:
+            return None
+        payload = self._data.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return None
+        return payload
+
+    # Record di keys.dat mulai dari offset `start`: (key id, offset, panjang record). Record rusak
+    # dilewati sampai record valid berikutnya; jika tidak ada lagi (ekor terpotong), file dipotong di sana.
+    def _scan(self, start):
+        entries = []
+        offset = start
+        end = self._data.seek(0, os.SEEK_END)
+        while offset < end:
+            payload = self._read_record(offset)
+            if payload is None:
+                resume = self._next_record(offset + 1, end)
+                if resume is None:
+                    self._data.truncate(offset)
+                    return entries, offset
+                offset = resume
+                continue
+            size = RECORD_HEADER.size + len(payload)
+            entries.append((key_id(_record_n(payload)), offset, size))
+            offset += size
+        return entries, offset
+
+    # Offset record valid pertama di [start, end); None jika tidak ada
+    def _next_record(self, start, end):
+        self._data.seek(start)
+        rest = self._data.read(end - start)
+        pos = rest.find(RECORD_MAGIC)
+        while pos >= 0:
+            if self._read_record(start + pos) is not None:
+                return start + pos
+            pos = rest.find(RECORD_MAGIC, pos + 1)
+        return None
+
+    def _rebuild(self):
+        entries, end = self._scan(0)
+        slots = INITIAL_SLOTS
+        while len(entries) > slots * MAX_LOAD:
+            slots *= 2
+        self._write_index(slots, entries, end)
+
+    # Indeks record yang ditambahkan setelah indeks terakhir ditulis (mis. proses mati sebelum insert)
+    def _catch_up(self):
+        indexed = self._header()[2]
+        if self._data.seek(0, os.SEEK_END) == indexed:
+            return
+        entries, end = self._scan(indexed)
+        for entry in entries:
+            self._add_entry(*entry)
+        slots, count, _ = self._header()
+        self._write_header(self._index, slots, count, end)
+
+    def _add_entry(self, kid, offset, length):
+        slots, count, indexed = self._header()
+        if count + 1 > slots * MAX_LOAD:
+            self._write_index(slots * 2, self._entries(), indexed)
+            slots = self._header()[0]
+        if not self._insert(self._index, slots, kid, offset, length):
+            return False
+        self._write_header(self._index, slots, count + 1, indexed)
+        return True
+
+    def _lookup(self, kid):
+        slots = self._header()[0]
+        _, offset, length = self._probe(self._index, slots, kid)
+        return (offset, length) if length else None
+
+    # Simpan pasangan kunci; mengembalikan key id (hex). Kunci yang sudah ada tidak ditulis ulang.
+    # Satu modulus hanya boleh punya satu pasangan (e, d) karena key id diturunkan dari n.
+    def save(self, keypair, label="", sync=False):
+        kid = key_id(keypair.n)
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._catch_up()
+            found = self._lookup(kid)
+            if found is not None:
+                existing = _decode(kid, self._read_record(found[0])).keypair
+                if (existing.n, existing.e, existing.d) != (keypair.n, keypair.e, keypair.d):
+                    raise ValueError(f"Key id {kid.hex()} sudah dipakai kunci lain (modulus sama, eksponen berbeda)")
+                return kid.hex()
+            payload = _encode(keypair, label, time.time())
+            record = RECORD_HEADER.pack(RECORD_MAGIC, len(payload), zlib.crc32(payload)) + payload
+            offset = self._data.seek(0, os.SEEK_END)
+            self._data.write(record)
+            self._data.flush()
+            if sync:
+                os.fsync(self._data.fileno())
+            self._add_entry(kid, offset, len(record))
+            slots, count, _ = self._header()
+            self._write_header(self._index, slots, count, offset + len(record))
+            if sync:
+                self._index.flush()
+        return kid.hex()
+
+    # Muat kunci berdasarkan id (16 digit hex atau 8 byte); KeyError jika tidak ada
+    def load(self, kid):
+        kid = _parse_id(kid)
+        with self._lock:
+            found = self._lookup(kid)
+            if found is None:
+                # mungkin baru ditambahkan proses lain
+                self._refresh()
+                found = self._lookup(kid)
+            if found is None:
+                raise KeyError(kid.hex())
+            payload = self._read_record(found[0])
+        if payload is None:
+            raise ValueError(f"Record kunci {kid.hex()} rusak")
+        return _decode(kid, payload)
+
+    def get(self, kid, default=None):
+        try:
+            return self.load(kid)
+        except KeyError:
+            return default
+
+    # Kunci untuk modulus n (mis. dari header .rsac) atau None
+    def find(self, n):
+        return self.get(key_id(n))
+
+    def __contains__(self, kid):
+        with self._lock:
+            return self._lookup(_parse_id(kid)) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._header()[1]
+
+    # Semua key id (hex), urutan slot indeks
+    def ids(self):
+        with self._lock:
+            return [kid.hex() for kid, _, _ in self._entries()]
+
+    def close(self):
+        with self._lock:
+            self._unmap()
+            self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,161 @@
+# Instrumentasi tahap: jumlah panggilan dan durasi per nama tahap (is_prime, mod_inverse,
+# encrypt_text, tabel, ...). Perekaman aktif jika RSA_METRICS=1 (seluruh proses) atau di antara
+# start_run() dan finish_run() pada thread yang sama (satu rerun aplikasi). Saat tidak aktif,
+# stage() mengembalikan context manager kosong bersama: biayanya hanya satu pengecekan flag.
+#
+# Ekspor: to_prometheus() (format teks Prometheus), snapshot() (dict untuk JSON), dan satu baris
+# log JSON per run di logger "rsa_core.metrics" (level INFO). profile() merekam cProfile opsional.
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get("RSA_METRICS", "0") == "1"
+
+logger = logging.getLogger(__name__)
+
+_NULL = nullcontext()
+
+# Status run per thread; default di kelas agar pengecekan saat nonaktif tidak memicu AttributeError
+class _Local(threading.local):
+    run = None
+    depth = 0
+    started = 0.0
+
+_local = _Local()
+_lock = threading.Lock()
+# nama tahap -> [jumlah panggilan, total detik, durasi maksimum], akumulatif sejak reset()
+_totals = {}
+
+def configure(enabled=None):
+    global ENABLED
+    if enabled is not None:
+        ENABLED = bool(enabled)
+
+class _Stage:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        _local.depth += 1
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        _local.depth -= 1
+        record(self.name, elapsed, nested=_local.depth > 0)
+        return False
+
+# Context manager pengukur satu tahap; tahap boleh bersarang
+def stage(name):
+    if ENABLED or _local.run is not None:
+        return _Stage(name)
+    return _NULL
+
+# Dekorator: ukur setiap panggilan fungsi sebagai tahap `name`
+def timed(name):
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if ENABLED or _local.run is not None:
+                with _Stage(name):
+                    return fn(*args, **kwargs)
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+# Catat satu pengukuran. nested=True: tahap di dalam tahap lain (tidak ikut dijumlahkan
+# saat menghitung waktu di luar tahap terukur)
+def record(name, seconds, nested=False):
+    with _lock:
+        total = _totals.get(name)
+        if total is None:
+            _totals[name] = [1, seconds, seconds]
+        else:
+            total[0] += 1
+            total[1] += seconds
+            total[2] = max(total[2], seconds)
+    run = _local.run
+    if run is not None:
+        entry = run.get(name)
+        if entry is None:
+            run[name] = {"calls": 1, "seconds": seconds, "nested": nested}
+        else:
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            entry["nested"] = entry["nested"] and nested
+
+# Mulai merekam satu run (mis. satu rerun Streamlit) di thread ini
+def start_run():
+    _local.run = {}
+    _local.depth = 0
+    _local.started = time.perf_counter()
+
+# Akhiri run: kembalikan rincian tahap dan tulis satu baris log JSON
+def finish_run():
+    stages = _local.run
+    if stages is None:
+        return None
+    total = time.perf_counter() - _local.started
+    _local.run = None
+    measured = sum(entry["seconds"] for entry in stages.values() if not entry["nested"])
+    run = {"total_s": total, "unmeasured_s": max(0.0, total - measured), "stages": stages}
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": "rsa_run", **run}))
+    return run
+
+def snapshot():
+    with _lock:
+        return {name: {"calls": calls, "seconds": seconds, "max_s": longest}
+                for name, (calls, seconds, longest) in _totals.items()}
+
+def reset():
+    with _lock:
+        _totals.clear()
+
+_PROMETHEUS_METRICS = (
+    ("rsa_stage_calls_total", "counter", "Jumlah panggilan per tahap", "calls"),
+    ("rsa_stage_seconds_total", "counter", "Total durasi per tahap (detik)", "seconds"),
+    ("rsa_stage_seconds_max", "gauge", "Durasi terlama satu panggilan per tahap (detik)", "max_s"),
+)
+
+# Semua statistik akumulatif dalam format teks Prometheus
+def to_prometheus():
+    stats = snapshot()
+    lines = []
+    for metric, kind, help_text, field in _PROMETHEUS_METRICS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, values in stats.items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{metric}{{stage="{label}"}} {values[field]:.9g}')
+    return "\n".join(lines) + "\n"
+
+# Rekam cProfile untuk thread ini selama blok berjalan. Yield dict yang setelah blok selesai
+# berisi "text" (laporan pstats, `limit` baris teratas) atau "error" jika profiler lain aktif.
+@contextmanager
+def profile(sort="cumulative", limit=30):
+    import cProfile
+    import io
+    import pstats
+    result = {}
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as exc:
+        result["error"] = str(exc)
+        yield result
+        return
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+        result["text"] = out.getvalue()
@@ -0,0 +1,131 @@
+# Pemangkatan modular dengan prakomputasi per kunci (exp, mod). Setiap karakter/blok dalam satu
+# pesan dipangkatkan dengan exp dan mod yang sama, jadi pengodean ulang eksponen menjadi digit
+# jendela (dan konstanta Montgomery) cukup dihitung sekali lalu dipakai untuk semua nilai.
+#
+# SlidingWindow: jendela geser dengan reduksi `%`, dipakai backend "python". Di CPython reduksi
+#   `%` lebih cepat daripada REDC Montgomery yang ditulis di Python.
+# FixedWindow: jendela tetap di atas perkalian Montgomery. Setiap digit selalu memakai w
+#   kuadrat + satu perkalian dengan entri tabel (termasuk digit 0), sehingga urutan operasi tidak
+#   bergantung pada bit eksponen. Dipakai untuk dekripsi constant-time (opsional). Bilangan
+#   bulat Python sendiri tidak constant-time, jadi ini hanya menghilangkan kebocoran pola bit.
+
+# Ukuran jendela menurut panjang eksponen (bit): lebih lebar = tabel lebih besar, perkalian lebih sedikit
+_WINDOW_LIMITS = ((24, 1), (80, 3), (240, 4), (672, 5))
+
+def window_size(bits):
+    for limit, width in _WINDOW_LIMITS:
+        if bits <= limit:
+            return width
+    return 6
+
+# Eksponen -> daftar (jumlah kuadrat, digit ganjil atau 0) dari bit paling signifikan
+def sliding_window_plan(exp, width):
+    bits = bin(exp)[2:] if exp else ""
+    plan = []
+    i = 0
+    while i < len(bits):
+        if bits[i] == "0":
+            plan.append((1, 0))
+            i += 1
+            continue
+        j = min(i + width, len(bits))
+        while bits[j - 1] == "0":
+            j -= 1
+        plan.append((j - i, int(bits[i:j], 2)))
+        i = j
+    return plan
+
+# Eksponen -> digit basis 2^width dengan jumlah tetap (digit teratas boleh 0)
+def fixed_window_digits(exp, width):
+    count = max(1, -(-exp.bit_length() // width))
+    mask = (1 << width) - 1
+    return [(exp >> (width * i)) & mask for i in reversed(range(count))]
+
+class SlidingWindow:
+    def __init__(self, exp, mod, width=None):
+        if exp < 0 or mod < 1:
+            raise ValueError("Eksponen harus >= 0 dan modulus >= 1")
+        self.exp = exp
+        self.mod = mod
+        self.width = width or window_size(exp.bit_length())
+        self.plan = sliding_window_plan(exp, self.width)
+        # satu entri per kuadrat: 0 = hanya kuadrat, i > 0 = lalu kalikan dengan table[i - 1].
+        # Jendela pertama tidak perlu kuadrat (akumulator masih 1), jadi langsung jadi nilai awal.
+        steps = []
+        for squarings, digit in self.plan[1:]:
+            steps.extend([0] * (squarings - 1))
+            steps.append((digit >> 1) + 1 if digit else 0)
+        self._first = self.plan[0][1] >> 1 if self.plan else None
+        self._steps = steps
+
+    def __call__(self, base):
+        mod = self.mod
+        if self._first is None:
+            return 1 % mod
+        x = base % mod
+        # tabel pangkat ganjil x, x^3, x^5, ... x^(2^width - 1)
+        table = [x]
+        if self.width > 1:
+            x2 = x * x % mod
+            for _ in range((1 << (self.width - 1)) - 1):
+                table.append(table[-1] * x2 % mod)
+        acc = table[self._first]
+        for step in self._steps:
+            acc = acc * acc % mod
+            if step:
+                acc = acc * table[step - 1] % mod
+        return acc
+
+# Konstanta Montgomery untuk modulus ganjil: R = 2^shift dengan R > 4·mod, sehingga hasil
+# REDC dari dua operand < 2·mod tetap < 2·mod tanpa pengurangan bersyarat di tengah jalan
+class Montgomery:
+    def __init__(self, mod):
+        if mod < 3 or mod % 2 == 0:
+            raise ValueError("Montgomery membutuhkan modulus ganjil > 1")
+        self.mod = mod
+        self.shift = mod.bit_length() + 2
+        self.mask = (1 << self.shift) - 1
+        # factor = -mod^-1 mod R
+        self.factor = -pow(mod, -1, 1 << self.shift) & self.mask
+        self.r2 = pow(2, 2 * self.shift, mod)
+        self.one = (1 << self.shift) % mod
+
+    def reduce(self, t):
+        return (t + ((t & self.mask) * self.factor & self.mask) * self.mod) >> self.shift
+
+    def to_mont(self, x):
+        return self.reduce(x % self.mod * self.r2)
+
+    # Keluar dari bentuk Montgomery; pengurangan terakhir tanpa cabang
+    def from_mont(self, x):
+        x = self.reduce(x)
+        return x - self.mod * (x >= self.mod)
+
+class FixedWindow:
+    def __init__(self, exp, mod, width=None):
+        if exp < 0:
+            raise ValueError("Eksponen harus >= 0")
+        self.exp = exp
+        self.mod = mod
+        self.width = width or window_size(exp.bit_length())
+        self.digits = fixed_window_digits(exp, self.width)
+        self.mont = Montgomery(mod)
+
+    def __call__(self, base):
+        mont = self.mont
+        mod, mask, factor, shift = mont.mod, mont.mask, mont.factor, mont.shift
+        # tabel x^0 ... x^(2^width - 1) dalam bentuk Montgomery
+        x = mont.to_mont(base)
+        table = [mont.one, x]
+        for _ in range((1 << self.width) - 2):
+            t = table[-1] * x
+            table.append((t + ((t & mask) * factor & mask) * mod) >> shift)
+        acc = mont.one
+        for digit in self.digits:
+            for _ in range(self.width):
+                t = acc * acc
+                acc = (t + ((t & mask) * factor & mask) * mod) >> shift
+            t = acc * table[digit]
+            acc = (t + ((t & mask) * factor & mask) * mod) >> shift
+        return mont.from_mont(acc)
+
@@ -0,0 +1,101 @@
+# Eksekusi paralel enkripsi/dekripsi: input dipecah menjadi batch, dikirim ke pool
+# worker, lalu hasilnya disusun kembali sesuai urutan. Input kecil tetap diproses serial
+# karena biaya kirim-terima antar proses lebih besar daripada perhitungannya.
+import os
+import sys
+import threading
+from collections import deque
+
+from .stream import decrypt_batch, encrypt_batch
+
+# Jumlah worker, ukuran batch, dan ambang minimum jumlah nilai untuk mode paralel
+WORKERS = int(os.environ.get("RSA_WORKERS", 0)) or os.cpu_count() or 1
+BATCH_SIZE = int(os.environ.get("RSA_BATCH_SIZE", 2048))
+MIN_PARALLEL_ITEMS = int(os.environ.get("RSA_MIN_PARALLEL_ITEMS", 4096))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# True jika interpreter berjalan tanpa GIL (free-threaded build), sehingga thread cukup
+def gil_free():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+def configure(workers=None, batch_size=None, min_parallel_items=None):
+    global WORKERS, BATCH_SIZE, MIN_PARALLEL_ITEMS
+    if workers is not None:
+        WORKERS = max(1, int(workers))
+        shutdown()
+    if batch_size is not None:
+        BATCH_SIZE = max(1, int(batch_size))
+    if min_parallel_items is not None:
+        MIN_PARALLEL_ITEMS = max(0, int(min_parallel_items))
+
+# Pool worker bersama (dibuat saat pertama kali dibutuhkan). Modul executor baru diimpor
+# di sini agar `import rsa_core` tetap ringan untuk pemakaian serial/CLI.
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+            if gil_free():
+                _executor = ThreadPoolExecutor(max_workers=WORKERS)
+            else:
+                _executor = ProcessPoolExecutor(
+                    max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+def shutdown(wait=True):
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+def split_batches(values, batch_size=None):
+    batch_size = batch_size or BATCH_SIZE
+    return [values[i:i + batch_size] for i in range(0, len(values), batch_size)]
+
+# Jalankan fn(*args) untuk setiap args secara paralel; hasil dikembalikan sesuai urutan input.
+# Jumlah tugas yang sedang berjalan dibatasi agar memori tetap datar pada input streaming.
+def imap_ordered(fn, arg_tuples, executor=None, max_inflight=None):
+    executor = executor or get_executor()
+    max_inflight = max_inflight or 2 * WORKERS
+    inflight = deque()
+    for args in arg_tuples:
+        inflight.append(executor.submit(fn, *args))
+        if len(inflight) >= max_inflight:
+            yield inflight.popleft().result()
+    while inflight:
+        yield inflight.popleft().result()
+
+# Seperti imap_ordered, tetapi dijalankan serial jika parallel=False
+def map_ordered(fn, arg_tuples, parallel=True):
+    if not parallel or WORKERS <= 1:
+        return (fn(*args) for args in arg_tuples)
+    return imap_ordered(fn, arg_tuples)
+
+# True jika jumlah nilai cukup besar sehingga mode paralel sepadan dengan overhead-nya.
+# Jumlah worker diatur lewat configure(workers=...) atau RSA_WORKERS.
+def use_parallel(count):
+    return WORKERS > 1 and count >= MIN_PARALLEL_ITEMS
+
+# Enkripsi list nilai m -> list ciphertext, paralel untuk input besar
+def parallel_encrypt(values, e, n, batch_size=None):
+    if not use_parallel(len(values)):
+        return encrypt_batch(values, e, n)
+    result = []
+    for batch in imap_ordered(encrypt_batch, ((b, e, n) for b in split_batches(values, batch_size))):
+        result.extend(batch)
+    return result
+
+# Dekripsi list ciphertext -> list nilai m, paralel untuk input besar
+def parallel_decrypt(values, d, n, private_key=None, batch_size=None):
+    if not use_parallel(len(values)):
+        return decrypt_batch(values, d, n, private_key)
+    result = []
+    args = ((b, d, n, private_key) for b in split_batches(values, batch_size))
+    for batch in imap_ordered(decrypt_batch, args):
+        result.extend(batch)
+    return result
@@ -0,0 +1,149 @@
+import math
+import random
+from functools import lru_cache
+
+# Batas atas saringan bilangan prima kecil
+SMALL_PRIME_LIMIT = 2000
+
+# Pengaturan uji untuk bilangan besar (di atas batas deterministik)
+BIG_INT_METHOD = "bpsw"   # "bpsw" (Baillie-PSW) atau "mr" (Miller-Rabin acak)
+MR_ROUNDS = 40            # jumlah ronde Miller-Rabin jika BIG_INT_METHOD == "mr"
+CACHE_SIZE = 4096         # jumlah hasil terakhir yang disimpan di LRU cache
+
+# Saringan Eratosthenes untuk bilangan prima kecil
+def sieve(limit):
+    if limit < 2:
+        return []
+    flags = bytearray([1]) * (limit + 1)
+    flags[0] = flags[1] = 0
+    for i in range(2, math.isqrt(limit) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytearray(len(range(i * i, limit + 1, i)))
+    return [i for i, flag in enumerate(flags) if flag]
+
+SMALL_PRIMES = tuple(sieve(SMALL_PRIME_LIMIT))
+_SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+# Hasil kali semua prima kecil: satu gcd menggantikan ratusan pembagian
+_SMALL_PRIME_PRODUCT = math.prod(SMALL_PRIMES)
+
+# Basis Miller-Rabin yang deterministik untuk n < 3.3 * 10^24 (mencakup semua bilangan 64-bit)
+_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+# Satu ronde Miller-Rabin (strong probable prime) untuk basis a
+def _miller_rabin(n, a, d, s):
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+def _split_power_of_two(m):
+    s = (m & -m).bit_length() - 1
+    return m >> s, s
+
+def miller_rabin(n, bases):
+    d, s = _split_power_of_two(n - 1)
+    return all(_miller_rabin(n, a % n, d, s) for a in bases if a % n)
+
+def random_miller_rabin(n, rounds):
+    rng = random.SystemRandom()
+    d, s = _split_power_of_two(n - 1)
+    return all(_miller_rabin(n, rng.randrange(2, n - 1), d, s) for _ in range(rounds))
+
+# Simbol Jacobi (a/n) untuk n ganjil positif
+def jacobi(a, n):
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+# Uji strong Lucas probable prime dengan parameter Selfridge (metode A)
+def strong_lucas(n):
+    if math.isqrt(n) ** 2 == n:
+        return False
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = _split_power_of_two(n + 1)
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = P * U + V, D * U + P * V
+            if U % 2:
+                U += n
+            if V % 2:
+                V += n
+            U, V = (U // 2) % n, (V // 2) % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+# Baillie-PSW: Miller-Rabin basis 2 + strong Lucas
+def baillie_psw(n):
+    return miller_rabin(n, (2,)) and strong_lucas(n)
+
+# Uji prima tanpa cache (dipakai generator agar kandidat komposit tidak memenuhi cache)
+def is_prime_uncached(n):
+    if n < 2:
+        return False
+    if n <= SMALL_PRIME_LIMIT:
+        return n in _SMALL_PRIME_SET
+    if math.gcd(n, _SMALL_PRIME_PRODUCT) != 1:
+        return False
+    if n < SMALL_PRIME_LIMIT * SMALL_PRIME_LIMIT:
+        return True
+    if n < _DETERMINISTIC_LIMIT:
+        return miller_rabin(n, _DETERMINISTIC_BASES)
+    if BIG_INT_METHOD == "mr":
+        return miller_rabin(n, (2,)) and random_miller_rabin(n, MR_ROUNDS)
+    return baillie_psw(n)
+
+_is_prime_cached = lru_cache(maxsize=CACHE_SIZE)(is_prime_uncached)
+
+# Fungsi untuk mengecek bilangan prima
+def is_prime(n):
+    return _is_prime_cached(int(n))
+
+# Ubah metode uji bilangan besar, jumlah ronde, atau ukuran cache
+def configure(method=None, rounds=None, cache_size=None):
+    global BIG_INT_METHOD, MR_ROUNDS, CACHE_SIZE, _is_prime_cached
+    if method is not None:
+        if method not in ("bpsw", "mr"):
+            raise ValueError(f"Metode uji prima tidak dikenal: {method}")
+        BIG_INT_METHOD = method
+    if rounds is not None:
+        MR_ROUNDS = int(rounds)
+    if cache_size is not None:
+        CACHE_SIZE = int(cache_size)
+    _is_prime_cached = lru_cache(maxsize=CACHE_SIZE)(is_prime_uncached)
+
+def cache_info():
+    return _is_prime_cached.cache_info()
@@ -0,0 +1,68 @@
+import random
+
+from .primality import SMALL_PRIMES, is_prime, is_prime_uncached
+
+# Prima ganjil kecil untuk saringan jendela, beserta invers 2 mod p
+_SIEVE_PRIMES = SMALL_PRIMES[1:]
+_HALF_INVERSES = tuple((p + 1) // 2 for p in _SIEVE_PRIMES)
+
+# Di bawah ukuran ini kandidat bisa sama dengan prima saringan, jadi pakai pencarian biasa
+MIN_SIEVE_BITS = SMALL_PRIMES[-1].bit_length() + 1
+
+# Jumlah kandidat ganjil per jendela saringan, relatif terhadap ukuran bit
+WINDOW_FACTOR = 4
+
+# Generate bilangan prima acak dalam rentang [min_val, max_val). Bilangan diambil acak sampai
+# prima (sampling tolak), sehingga setiap prima dalam rentang sama peluangnya
+def generate_random_prime(min_val=10, max_val=100, rng=None):
+    rng = rng or random
+    if not any(is_prime(n) for n in range(min_val, max_val)):
+        return 7
+    while True:
+        n = rng.randrange(min_val, max_val)
+        if is_prime(n):
+            return n
+
+# Titik awal acak: dua bit teratas diset agar hasil kali dua prima hasil _search tepat
+# 2*bits bit, bit terbawah agar ganjil
+def _random_start(bits, rng):
+    return rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+
+# Saringan inkremental: flags[i] == 0 jika start + 2i habis dibagi prima kecil
+def sieve_window(start, size):
+    flags = bytearray([1]) * size
+    for p, half in zip(_SIEVE_PRIMES, _HALF_INVERSES):
+        i = (-(start % p) * half) % p
+        flags[i::p] = bytes(len(range(i, size, p)))
+    return flags
+
+def _search(bits, rng):
+    upper = 1 << bits
+    window = max(64, WINDOW_FACTOR * bits)
+    while True:
+        start = _random_start(bits, rng)
+        while start < upper:
+            size = min(window, (upper - start + 1) // 2)
+            flags = sieve_window(start, size)
+            i = flags.find(1)
+            while i != -1:
+                candidate = start + 2 * i
+                if is_prime_uncached(candidate):
+                    return candidate
+                i = flags.find(1, i + 1)
+            start += 2 * size
+
+# Generate bilangan prima acak dengan panjang tepat `bits` bit
+def generate_prime(bits, rng=None):
+    if bits < 2:
+        raise ValueError("Ukuran bit minimal 2")
+    rng = rng or random.SystemRandom()
+    if bits < MIN_SIEVE_BITS:
+        return generate_random_prime(1 << (bits - 1), 1 << bits, rng)
+    return _search(bits, rng)
+
+# Mode massal: hasilkan `count` bilangan prima `bits` bit satu per satu (untuk mengisi pool kunci)
+def generate_primes(bits, count, rng=None):
+    rng = rng or random.SystemRandom()
+    for _ in range(count):
+        yield generate_prime(bits, rng)
@@ -0,0 +1,355 @@
+# Layanan HTTP asyncio untuk keygen/enkripsi/dekripsi, hanya memakai pustaka standar.
+#
+#   python -m rsa_core serve --port 8080
+#
+#   POST /keygen   {"bits": 1024, "e": 65537}                       -> {"n", "e", "d", "p", "q"}
+#   POST /encrypt  {"n", "e", "message", "mode"}                    -> {"cipher": [...], "mode"}
+#   POST /decrypt  {"n", "d", "cipher": [...], "mode", "p"?, "q"?}  -> {"message", "mode"}
+#   GET  /health, GET /stats
+#
+# Permintaan yang datang bersamaan dengan kunci yang sama digabung (micro-batching) menjadi
+# satu pemanggilan encrypt_batch/decrypt_batch di pool worker, sehingga event loop tidak
+# pernah menjalankan pemangkatan modular sendiri. /keygen berjalan di pool proses terpisah
+# (KEYGEN_WORKERS) agar batch enkripsi/dekripsi tidak mengantre di belakang pencarian prima.
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+
+from . import parallel
+from .blocks import MODE_BLOK, MODE_KARAKTER
+from .keys import DEFAULT_E, generate_keypair, make_private_key
+from .stream import decrypt_batch, encrypt_batch, iter_plain_batches, iter_text
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+# Waktu tunggu maksimum untuk mengumpulkan permintaan dengan kunci yang sama (detik)
+BATCH_DELAY = 0.002
+# Jumlah nilai maksimum per batch; batch yang penuh langsung dikirim ke worker
+BATCH_MAX_VALUES = 4096
+# Antrean koneksi TCP; default asyncio (100) membuat klien ke-101 dst. menunggu retry SYN ~1 detik
+BACKLOG = 1024
+# Ukuran body permintaan maksimum (byte)
+MAX_BODY = 1 << 20
+# Rentang ukuran kunci yang boleh diminta lewat /keygen
+KEYGEN_BITS = (16, 4096)
+# Jumlah proses untuk /keygen tanpa KeyPool; permintaan keygen berikutnya mengantre di sini
+KEYGEN_WORKERS = 1
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+class _Group:
+    def __init__(self):
+        self.values = []
+        self.slices = []
+        self.timer = None
+
+# Kumpulkan permintaan dengan (fn, args kunci) yang sama selama `delay` detik atau sampai
+# `max_values` nilai, lalu jalankan sekali fn(values, *args) di executor dan bagikan hasilnya.
+class MicroBatcher:
+    def __init__(self, executor=None, delay=BATCH_DELAY, max_values=BATCH_MAX_VALUES):
+        self.executor = executor
+        self.delay = delay
+        self.max_values = max_values
+        self._groups = {}
+        self.requests = 0
+        self.batches = 0
+        self.values = 0
+
+    async def submit(self, fn, args, values):
+        if not values:
+            return []
+        loop = asyncio.get_running_loop()
+        key = (fn, args)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group()
+            group.timer = loop.call_later(self.delay, self._flush, key, group)
+        future = loop.create_future()
+        group.slices.append((len(group.values), len(group.values) + len(values), future))
+        group.values.extend(values)
+        self.requests += 1
+        if len(group.values) >= self.max_values:
+            self._flush(key, group)
+        return await future
+
+    def _flush(self, key, group):
+        if self._groups.get(key) is not group:
+            return
+        del self._groups[key]
+        group.timer.cancel()
+        self.batches += 1
+        self.values += len(group.values)
+        fn, args = key
+        task = asyncio.get_running_loop().run_in_executor(
+            self.executor or parallel.get_executor(), fn, group.values, *args)
+        task.add_done_callback(lambda task: self._deliver(task, group))
+
+    @staticmethod
+    def _deliver(task, group):
+        error = task.exception()
+        result = None if error else task.result()
+        for start, end, future in group.slices:
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(result[start:end])
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "values": self.values,
+            "avg_requests_per_batch": self.requests / self.batches if self.batches else None,
+            "open_groups": len(self._groups),
+        }
+
+def _int_field(data, name, default=None):
+    value = data.get(name, default)
+    if value is None:
+        raise ValueError(f"Field '{name}' wajib diisi")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Field '{name}' harus bilangan bulat") from None
+
+def _modulus_field(data):
+    n = _int_field(data, "n")
+    if n <= 2:
+        raise ValueError("Field 'n' harus lebih besar dari 2")
+    return n
+
+def _mode_field(data):
+    mode = data.get("mode", MODE_KARAKTER)
+    if mode not in (MODE_KARAKTER, MODE_BLOK):
+        raise ValueError(f"Mode harus '{MODE_KARAKTER}' atau '{MODE_BLOK}'")
+    return mode
+
+# Kunci privat CRT per (p, q, d), dihitung sekali untuk permintaan berulang
+@lru_cache(maxsize=64)
+def _private_key(p, q, d):
+    return make_private_key(p, q, d)
+
+class RSAServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, delay=BATCH_DELAY,
+                 max_values=BATCH_MAX_VALUES, executor=None, key_pool=None, keygen_executor=None):
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(executor, delay, max_values)
+        self.key_pool = key_pool
+        self.keygen_executor = keygen_executor
+        self._own_keygen_executor = False
+        self.started = time.time()
+        self._server = None
+        self.routes = {
+            "/keygen": ("POST", self.keygen),
+            "/encrypt": ("POST", self.encrypt),
+            "/decrypt": ("POST", self.decrypt),
+            "/health": ("GET", self.health),
+            "/stats": ("GET", self.stats),
+        }
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, backlog=BACKLOG)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._own_keygen_executor:
+            self.keygen_executor.shutdown(wait=False, cancel_futures=True)
+            self.keygen_executor, self._own_keygen_executor = None, False
+
+    # Pool proses khusus keygen, dibuat saat /keygen pertama (bukan pool bersama parallel)
+    def _keygen_pool(self):
+        if self.keygen_executor is None:
+            self.keygen_executor = ProcessPoolExecutor(
+                max_workers=KEYGEN_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            self._own_keygen_executor = True
+        return self.keygen_executor
+
+    async def keygen(self, data):
+        bits = _int_field(data, "bits", 1024)
+        e = _int_field(data, "e", DEFAULT_E)
+        if not KEYGEN_BITS[0] <= bits <= KEYGEN_BITS[1]:
+            raise ValueError(f"bits harus di antara {KEYGEN_BITS[0]} dan {KEYGEN_BITS[1]}")
+        # e genap tidak pernah relatif prima dengan φ, pencarian kunci tidak akan selesai
+        if e < 3 or e % 2 == 0:
+            raise ValueError("Field 'e' harus bilangan ganjil ≥ 3")
+        loop = asyncio.get_running_loop()
+        if self.key_pool is not None and e == self.key_pool.e:
+            key = await loop.run_in_executor(None, self.key_pool.get, bits)
+        else:
+            key = await loop.run_in_executor(self._keygen_pool(), generate_keypair, bits, e)
+        return {"n": key.n, "e": key.e, "d": key.d, "p": key.p, "q": key.q}
+
+    async def encrypt(self, data):
+        n, e, mode = _modulus_field(data), _int_field(data, "e"), _mode_field(data)
+        if not 1 < e < n:
+            raise ValueError("Field 'e' harus memenuhi 1 < e < n")
+        message = data.get("message")
+        if not isinstance(message, str):
+            raise ValueError("Field 'message' harus berupa teks")
+        values = list(chain.from_iterable(iter_plain_batches([message.encode("utf-8")], n, mode)))
+        if mode == MODE_KARAKTER and values and max(values) >= n:
+            raise ValueError(f"Karakter dengan kode {max(values)} ≥ n = {n}; pakai n lebih besar atau mode blok")
+        cipher = await self.batcher.submit(encrypt_batch, (e, n), values)
+        return {"cipher": cipher, "mode": mode}
+
+    async def decrypt(self, data):
+        n, d, mode = _modulus_field(data), _int_field(data, "d"), _mode_field(data)
+        if not 0 < d < n:
+            raise ValueError("Field 'd' harus memenuhi 0 < d < n")
+        cipher = data.get("cipher")
+        if not isinstance(cipher, list):
+            raise ValueError("Field 'cipher' harus berupa list bilangan")
+        try:
+            values = [int(c) for c in cipher]
+        except (TypeError, ValueError):
+            raise ValueError("Field 'cipher' harus berupa list bilangan") from None
+        private_key = None
+        if data.get("p") is not None and data.get("q") is not None:
+            p, q = _int_field(data, "p"), _int_field(data, "q")
+            if min(p, q) < 2 or p * q != n:
+                raise ValueError("p dan q harus lebih besar dari 1 dengan p × q = n")
+            private_key = _private_key(p, q, d)
+        plain = await self.batcher.submit(decrypt_batch, (d, n, private_key), values)
+        return {"message": "".join(iter_text([plain], n, mode)), "mode": mode}
+
+    async def health(self, data):
+        return {"status": "ok", "uptime_s": time.time() - self.started}
+
+    async def stats(self, data):
+        result = {"batcher": self.batcher.stats()}
+        if self.key_pool is not None:
+            result["key_pool"] = self.key_pool.stats()
+        return result
+
+    async def dispatch(self, method, path, body):
+        route = self.routes.get(path)
+        if route is None:
+            return 404, {"error": f"Path {path} tidak dikenal"}
+        allowed, handler = route
+        if method != allowed:
+            return 405, {"error": f"{path} hanya menerima {allowed}"}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("Body harus berupa objek JSON")
+            return 200, await handler(data)
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+
+    # HTTP/1.1 minimal: satu permintaan per iterasi, koneksi keep-alive dipakai ulang
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._respond(writer, 400, {"error": "Request line tidak valid"}, False)
+                    break
+                method, target, version = parts
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": f"Body melebihi {MAX_BODY} byte"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.dispatch(method, target.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        # Koneksi keep-alive yang menganggur dibatalkan saat server berhenti; tidak perlu di-log
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+# Klien HTTP kecil (satu koneksi keep-alive) untuk uji lokal dan benchmark
+class ServiceClient:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self._reader = self._writer = None
+
+    async def request(self, method, path, payload=None):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self._writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+                           .encode("latin-1") + body)
+        await self._writer.drain()
+        status = int((await self._reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        data = json.loads(await self._reader.readexactly(int(headers.get("content-length", 0))))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, data
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+def run(host=DEFAULT_HOST, port=DEFAULT_PORT, delay=BATCH_DELAY, max_values=BATCH_MAX_VALUES, key_pool=None):
+    server = RSAServer(host, port, delay, max_values, key_pool=key_pool)
+
+    async def main():
+        await server.start()
+        print(f"RSA service di http://{server.host}:{server.port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server.keygen_executor is not None:
+            server.keygen_executor.shutdown(wait=False, cancel_futures=True)
+        parallel.shutdown()
+        if key_pool is not None:
+            key_pool.shutdown(wait=False)
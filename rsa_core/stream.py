@@ -0,0 +1,204 @@
+# Pipeline generator untuk mengenkripsi/mendekripsi data besar per potongan (chunk)
+# tanpa memuat seluruh pesan ke memori. Setiap tahap menghasilkan "batch" berupa
+# list bilangan bulat untuk satu potongan input.
+import codecs
+import re
+import sys
+from itertools import chain
+
+from .blocks import MODE_BLOK, block_size, blocks_to_bytes, bytes_to_blocks, pad, unpad
+from .container import MAGIC, ContainerReader
+from .expcache import cached_mod_exp
+
+# Ukuran potongan baca default (byte)
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+CIPHER_HEADER = "=== RSA Encrypted Message ==="
+CIPHER_MARKER = "Ciphertext (numbers):"
+
+_NUMBER = re.compile(rb"\d+")
+_PUBLIC_KEY = re.compile(r"Public Key \(e, n\): \((\d+), (\d+)\)")
+_MODE = re.compile(r"Mode: (\w+)")
+
+# Baca file-like per potongan berukuran chunk_size
+def read_chunks(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+# Potongan byte -> batch nilai plaintext (kode karakter atau blok), satu batch per potongan
+def iter_plain_batches(chunks, n, mode):
+    if mode == MODE_BLOK:
+        k = block_size(n)
+        if k < 1:
+            raise ValueError(f"Modulus n = {n} terlalu kecil untuk mode blok (n harus ≥ 256)")
+        carry = b""
+        for chunk in chunks:
+            data = carry + chunk
+            usable = len(data) - len(data) % k
+            if usable:
+                yield bytes_to_blocks(data[:usable], k)
+            carry = data[usable:]
+        yield bytes_to_blocks(pad(carry, k), k)
+    else:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield [ord(ch) for ch in text]
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield [ord(ch) for ch in text]
+
+def encrypt_batch(batch, e, n):
+    return cached_mod_exp(batch, e, n)
+
+def decrypt_batch(batch, d, n, private_key=None):
+    return cached_mod_exp(batch, d, n, private_key, secret=True)
+
+# Enkripsi lalu dekripsi satu batch (untuk verifikasi round-trip dalam satu tugas worker)
+def roundtrip_batch(batch, e, d, n, private_key=None):
+    cipher = encrypt_batch(batch, e, n)
+    return cipher, decrypt_batch(cipher, d, n, private_key)
+
+def encrypt_batches(batches, e, n):
+    for batch in batches:
+        yield encrypt_batch(batch, e, n)
+
+def decrypt_batches(batches, d, n, private_key=None):
+    for batch in batches:
+        yield decrypt_batch(batch, d, n, private_key)
+
+# Batch nilai plaintext hasil dekripsi -> potongan teks. Pada mode blok, blok terakhir
+# ditahan sampai finish() agar padding-nya bisa dibuang.
+class BatchTextDecoder:
+    def __init__(self, n, mode):
+        self.mode = mode
+        self.k = block_size(n)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = b""
+
+    # Nilai di luar rentang kode karakter / blok (kunci atau mode salah) -> ValueError
+    def feed(self, batch):
+        if not batch:
+            return ""
+        if self.mode != MODE_BLOK:
+            if max(batch) > sys.maxunicode:
+                raise ValueError(f"Nilai {max(batch)} bukan kode karakter yang valid; periksa kunci dan mode")
+            return "".join(map(chr, batch))
+        try:
+            blocks = blocks_to_bytes(batch, self.k)
+        except OverflowError:
+            raise ValueError(f"Nilai {max(batch)} tidak muat dalam blok {self.k} byte; periksa kunci dan mode") from None
+        data = self._pending + blocks
+        self._pending = data[-self.k:]
+        return self._decoder.decode(data[:-self.k])
+
+    def finish(self):
+        if self.mode != MODE_BLOK:
+            return ""
+        return self._decoder.decode(unpad(self._pending), final=True)
+
+def iter_text(batches, n, mode):
+    decoder = BatchTextDecoder(n, mode)
+    for batch in batches:
+        text = decoder.feed(batch)
+        if text:
+            yield text
+    text = decoder.finish()
+    if text:
+        yield text
+
+# Tulis ciphertext ke file biner `out` dalam format teks yang sama dengan download aplikasi
+def write_cipher_text(out, batches, e, n, mode):
+    out.write(f"{CIPHER_HEADER}\nPublic Key (e, n): ({e}, {n})\nMode: {mode}\nCiphertext (numbers): [".encode())
+    count = 0
+    for batch in batches:
+        if not batch:
+            continue
+        out.write(((", " if count else "") + ", ".join(map(str, batch))).encode())
+        count += len(batch)
+    out.write(b"]\n")
+    return count
+
+# Baca ciphertext per potongan: format write_cipher_text (header + daftar bilangan dalam [...])
+# atau bilangan saja yang dipisah spasi/koma/baris baru. Header dibaca di __init__, lalu
+# iterasi menghasilkan satu batch bilangan per potongan; angka yang terpotong di batas
+# potongan disambung ke potongan berikutnya.
+class CipherTextReader:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.public_key = None
+        self.mode = None
+        self._closed = False
+        self._buffer = self._read_header()
+
+    def _read_header(self):
+        header = CIPHER_HEADER.encode()
+        marker = CIPHER_MARKER.encode()
+        buffer = b""
+        for chunk in self._chunks:
+            buffer += chunk
+            start = buffer.lstrip()
+            if not header.startswith(start[:len(header)]):
+                return buffer
+            pos = buffer.find(marker)
+            if pos >= 0:
+                break
+        else:
+            start = buffer.lstrip()
+            if not start.startswith(header):
+                return buffer
+            raise ValueError(f"Header ciphertext tidak lengkap: '{CIPHER_MARKER}' tidak ditemukan")
+        text = buffer[:pos].decode("utf-8", errors="replace")
+        match = _PUBLIC_KEY.search(text)
+        if match:
+            self.public_key = (int(match.group(1)), int(match.group(2)))
+        match = _MODE.search(text)
+        if match:
+            self.mode = match.group(1)
+        self._closed = True
+        return buffer[pos + len(marker):]
+
+    # Pastikan ciphertext (jika header-nya mencantumkan kunci publik) dibuat untuk modulus n
+    def check_key(self, n):
+        if self.public_key and self.public_key[1] != n:
+            raise ValueError(f"Ciphertext dibuat untuk n = {self.public_key[1]}, bukan n kunci ini")
+
+    def _parse(self, data, final=False):
+        if self._closed:
+            end = data.find(b"]")
+            if end >= 0:
+                data, final = data[:end], True
+        carry = b""
+        if not final:
+            stripped = data.rstrip(b"0123456789")
+            carry, data = data[len(stripped):], stripped
+        return [int(m) for m in _NUMBER.findall(data)], carry, final
+
+    def __iter__(self):
+        carry, done = b"", False
+        for chunk in chain([self._buffer], self._chunks):
+            batch, carry, done = self._parse(carry + chunk)
+            if batch:
+                yield batch
+            if done:
+                return
+        batch, _, _ = self._parse(carry, final=True)
+        if batch:
+            yield batch
+
+# Pembaca ciphertext sesuai isi input: container biner (.rsac) atau format teks
+def cipher_reader(chunks):
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= len(MAGIC):
+            break
+    chunks = chain([head], chunks)
+    if head.startswith(MAGIC):
+        return ContainerReader(chunks)
+    return CipherTextReader(chunks)
@@ -0,0 +1,60 @@
+# Pemangkatan modular tervektorisasi dengan NumPy untuk modulus kecil. Jika n² muat di
+# uint64, seluruh batch dipangkatkan sekaligus dengan square-and-multiply di atas array,
+# bukan satu pow() per nilai. NumPy bersifat opsional dan baru diimpor saat pertama dipakai
+# agar `import rsa_core` tetap ringan; tanpa NumPy semua pemanggil memakai jalur bilangan besar.
+import os
+
+# RSA_VECTOR=0 mematikan jalur NumPy
+ENABLED = os.environ.get("RSA_VECTOR", "1") != "0"
+# Batch lebih kecil dari ini lebih cepat lewat pow() biasa (overhead array per operasi)
+MIN_ITEMS = int(os.environ.get("RSA_VECTOR_MIN_ITEMS", 64))
+# Batas modulus: hasil kali dua sisa (< n) harus muat di uint64
+UINT64_LIMIT = 1 << 64
+
+_numpy = None
+
+def _load_numpy():
+    global _numpy, ENABLED
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            ENABLED = False
+            return None
+        _numpy = numpy
+    return _numpy
+
+def fits(n):
+    return 1 < n and n * n < UINT64_LIMIT
+
+# True jika batch berisi `count` nilai modulo n sebaiknya dihitung di jalur NumPy
+def use_vector(n, count):
+    return ENABLED and count >= MIN_ITEMS and fits(n) and _load_numpy() is not None
+
+def configure(enabled=None, min_items=None):
+    global ENABLED, MIN_ITEMS
+    if enabled is not None:
+        ENABLED = bool(enabled)
+    if min_items is not None:
+        MIN_ITEMS = max(0, int(min_items))
+
+# m^exp mod n untuk setiap nilai. Nilai negatif atau di luar uint64, dan eksponen negatif
+# (exp >>= 1 tidak pernah mencapai 0), memunculkan OverflowError; pemanggil lalu kembali ke
+# jalur pow() per nilai.
+def mod_exp(values, exp, n):
+    if exp < 0:
+        raise OverflowError("Eksponen negatif tidak didukung jalur NumPy")
+    np = _load_numpy()
+    modulus = np.uint64(n)
+    base = np.array(values, dtype=np.uint64)
+    np.remainder(base, modulus, out=base)
+    result = np.full_like(base, 1 % n)
+    while exp:
+        if exp & 1:
+            np.multiply(result, base, out=result)
+            np.remainder(result, modulus, out=result)
+        exp >>= 1
+        if exp:
+            np.multiply(base, base, out=base)
+            np.remainder(base, modulus, out=base)
+    return result.tolist()
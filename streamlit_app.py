@@ -1,108 +1,505 @@
 import streamlit as st
-import math
-import random
 import pandas as pd
 import io
+import json
+import os
+import tempfile
+from collections import deque
+from contextlib import nullcontext
+from itertools import islice
 
-# Fungsi cari gcd
-def gcd(a, b):
-    while b != 0:
-        a, b = b, a % b
-    return a
-
-# Extended Euclidean Algorithm untuk cari invers modulo
-def mod_inverse(e, phi):
-    def egcd(a, b):
-        if a == 0:
-            return (b, 0, 1)
-        g, y, x = egcd(b % a, a)
-        return (g, x - (b // a) * y, y)
-    g, x, y = egcd(e, phi)
-    if g != 1:
-        raise Exception('Tidak ada invers modular')
-    else:
-        return x % phi
-
-# Fast modular exponentiation
-def mod_exp(base, exp, mod):
-    result = 1
-    base = base % mod
-    while exp > 0:
-        if exp % 2 == 1:
-            result = (result * base) % mod
-        exp //= 2
-        base = (base * base) % mod
-    return result
-
-# Konversi angka ke huruf A-Z (mod 26)
-def angka_ke_huruf(num):
-    return chr((num % 26) + 65)
-
-# Fungsi untuk mengecek bilangan prima
-def is_prime(n):
-    if n < 2:
-        return False
-    if n == 2:
-        return True
-    if n % 2 == 0:
-        return False
-    for i in range(3, int(math.sqrt(n)) + 1, 2):
-        if n % i == 0:
-            return False
-    return True
-
-# Generate bilangan prima acak
-def generate_random_prime(min_val=10, max_val=100):
-    primes = [n for n in range(min_val, max_val) if is_prime(n)]
-    if primes:
-        return random.choice(primes)
-    return 7
-
-# Enkripsi teks dengan support untuk semua karakter
-def encrypt_text(text, e, n, support_all_chars=False):
-    cipher_numbers = []
-    cipher_letters = []
-    encryption_data = []
+from rsa_core import is_prime, generate_random_prime, KeyPool, make_private_key, mod_inverse
+from rsa_core.blocks import MODE_KARAKTER, MODE_BLOK, block_size
+from rsa_core.cipher import (gcd, baris_enkripsi, baris_dekripsi, encrypt_text, decrypt_text,
+                             langkah_enkripsi, langkah_dekripsi)
+from rsa_core.stream import (BatchTextDecoder, decrypt_batch, iter_plain_batches, read_chunks, roundtrip_batch,
+                             write_cipher_text)
+from rsa_core.container import EXTENSION, HEADER, ContainerReader, is_container, pack_header, pack_values, value_width
+from rsa_core.parallel import map_ordered, use_parallel
+from rsa_core.keys import KeyPair
+from rsa_core.keystore import DEFAULT_PATH, KeyStore
+from rsa_core.batch import cross_records, encrypt_rows, result_rows, write_archive
+from rsa_core import expcache, metrics
+
+# Batas bilangan bulat yang aman untuk st.number_input (Number.MAX_SAFE_INTEGER di JavaScript)
+MAX_NUMBER_INPUT = 2**53 - 1
+
+# Pilihan ukuran bilangan prima acak (None = rentang contoh kelas 10-100)
+UKURAN_PRIMA = {
+    "10–100 (contoh kelas)": None,
+    "16 bit": 16,
+    "32 bit": 32,
+    "64 bit": 64,
+    "128 bit": 128,
+    "256 bit": 256,
+    "512 bit": 512,
+    "1024 bit": 1024,
+    "2048 bit": 2048,
+}
+
+# Jumlah pasangan kunci siap pakai per ukuran bit di pool latar belakang
+KEY_POOL_SIZE = 4
+
+# Satu pool kunci bersama untuk semua sesi di proses server ini
+@st.cache_resource
+def get_key_pool():
+    return KeyPool(target=KEY_POOL_SIZE)
+
+# Penyimpanan kunci persisten (rsa_core/keystore.py) bersama untuk semua sesi; lokasi dari RSA_KEYSTORE
+@st.cache_resource
+def get_key_store():
+    return KeyStore()
+
+# Buka penyimpanan kunci hanya saat sebuah aksi membutuhkannya. Lokasi yang tidak bisa dibuat atau
+# ditulis cukup diberi peringatan, agar bagian lain halaman tetap berjalan. None jika gagal.
+def buka_penyimpanan_kunci():
+    try:
+        return get_key_store()
+    except OSError as ex:
+        st.warning(f"⚠️ Penyimpanan kunci di {os.path.abspath(DEFAULT_PATH)} tidak bisa dibuka: {ex}")
+        return None
+
+# Input bilangan bulat; pakai text_input jika nilainya terlalu besar untuk number_input
+def input_bilangan(label, value, min_value=2, key=None, help=None):
+    if value <= MAX_NUMBER_INPUT:
+        return st.number_input(label, min_value=min_value, value=value, step=1, key=key, help=help)
+    teks = st.text_input(label, value=str(value), key=key, help=help)
+    try:
+        angka = int(teks.strip())
+    except ValueError:
+        st.error(f"❌ '{teks}' bukan bilangan bulat!")
+        st.stop()
+    if angka < min_value:
+        st.error(f"❌ Nilai minimal adalah {min_value}")
+        st.stop()
+    return angka
+
+# Bilangan di luar int64 dijadikan teks agar bisa ditampilkan oleh DataFrame
+def nilai_tabel(value):
+    if isinstance(value, int) and not -2**63 <= value < 2**63:
+        return str(value)
+    return value
+
+# DataFrame untuk tabel langkah per karakter
+def buat_dataframe(rows):
+    with metrics.stage("buat_dataframe"):
+        return pd.DataFrame([{k: nilai_tabel(v) for k, v in row.items()} for row in rows])
+
+# Jumlah baris per halaman tabel langkah; hanya halaman yang dilihat yang dibangun
+BARIS_PER_HALAMAN = 50
+# Panjang maksimum teks hasil (angka/huruf) yang ditampilkan; versi lengkap hanya lewat download
+TAMPIL_MAKS_KARAKTER = 2000
+
+# Daftar bilangan sebagai teks "[a, b, ...]" yang dipotong setelah `batas` karakter
+def ringkas_daftar(values, batas=TAMPIL_MAKS_KARAKTER):
+    bagian, panjang = [], 0
+    for i, value in enumerate(values):
+        teks = str(value)
+        if bagian and panjang + len(teks) > batas:
+            return "[" + ", ".join(bagian) + f", … +{len(values) - i} angka lagi]"
+        bagian.append(teks)
+        panjang += len(teks) + 2
+    return "[" + ", ".join(bagian) + "]"
+
+def ringkas_teks(teks, batas=TAMPIL_MAKS_KARAKTER):
+    if len(teks) <= batas:
+        return teks
+    return teks[:batas] + f"… (+{len(teks) - batas} karakter lagi, lihat file download)"
+
+# Tabel langkah per halaman: pesan pendek tampil langsung, pesan panjang hanya jika diminta
+# dan hanya halaman yang dipilih yang dibangun. buat_tabel(halaman) mengembalikan DataFrame.
+def tampilkan_tabel_langkah(jumlah, langkah, jenis, buat_tabel):
+    if jumlah <= BARIS_PER_HALAMAN:
+        st.write(f"**Langkah per {langkah}:**")
+        with metrics.stage(f"tabel_{jenis}"):
+            tabel = buat_tabel(1)
+        st.dataframe(tabel, width=800)
+        return
+    st.info(f"Pesan panjang ({jumlah} {langkah.lower()}); tabel detail ditampilkan per halaman "
+            f"berisi {BARIS_PER_HALAMAN} baris.")
+    if not st.checkbox(f"Lihat detail {jenis}", key=f"detail_{jenis}"):
+        return
+    total = -(-jumlah // BARIS_PER_HALAMAN)
+    halaman = st.number_input(f"Halaman (1–{total})", min_value=1, max_value=total, value=1, step=1,
+                              key=f"halaman_{jenis}_{total}")
+    awal = (halaman - 1) * BARIS_PER_HALAMAN
+    st.caption(f"Baris {awal + 1}–{min(awal + BARIS_PER_HALAMAN, jumlah)} dari {jumlah}")
+    with metrics.stage(f"tabel_{jenis}"):
+        tabel = buat_tabel(halaman)
+    st.dataframe(tabel, width=800)
+
+# Jumlah baris tabel langkah yang dibangun untuk file upload (sisanya hanya ada di file download)
+PREVIEW_ROWS = 50
+# Jumlah byte awal file yang ditampilkan sebagai preview
+PREVIEW_BYTES = 500
+
+# Enkripsi + dekripsi file secara streaming per potongan. Ciphertext (teks dan biner .rsac) dan
+# plaintext hasil dekripsi ditulis ke file sementara, tabel langkah hanya dibangun untuk
+# preview_rows baris pertama.
+def proses_file_stream(fileobj, e, d, n, private_key, mode, preview_rows=PREVIEW_ROWS):
+    fileobj.seek(0)
+    # File bernama agar setiap rerun bisa membukanya kembali; terhapus saat objeknya dibuang
+    cipher_file = tempfile.NamedTemporaryFile(prefix='rsa_cipher_', suffix='.txt')
+    biner_file = tempfile.NamedTemporaryFile(prefix='rsa_cipher_', suffix=EXTENSION)
+    plain_file = tempfile.NamedTemporaryFile(prefix='rsa_plain_', suffix='.txt')
+    lebar = value_width(n)
+    biner_file.write(pack_header(n, mode))
+    text_decoder = BatchTextDecoder(n, mode)
+    hasil = {
+        'cocok': True,
+        'jumlah': 0,
+        'encryption_data': [],
+        'decryption_data': [],
+    }
     
-    for ch in text:
-        ascii_val = ord(ch)
-        cipher_num = mod_exp(ascii_val, e, n)
-        cipher_letter = angka_ke_huruf(cipher_num)
-        
-        encryption_data.append({
-            'Karakter': ch if ch != ' ' else '␣',
-            'ASCII (m)': ascii_val,
-            f'm^{e} mod {n}': cipher_num,
-            'Cipher Huruf': cipher_letter
-        })
-        
-        cipher_numbers.append(cipher_num)
-        cipher_letters.append(cipher_letter)
+    # Batch plaintext disimpan sampai hasilnya kembali dari worker (urutan tetap terjaga)
+    plain_batches = deque()
     
-    return cipher_numbers, cipher_letters, encryption_data
+    def tugas():
+        for batch in iter_plain_batches(read_chunks(fileobj), n, mode):
+            plain_batches.append(batch)
+            yield batch, e, d, n, private_key
+    
+    def cipher_batches():
+        paralel = use_parallel(getattr(fileobj, 'size', 0))
+        for cipher, decrypted in map_ordered(roundtrip_batch, tugas(), paralel):
+            batch = plain_batches.popleft()
+            hasil['cocok'] = hasil['cocok'] and decrypted == batch
+            
+            sisa = preview_rows - len(hasil['encryption_data'])
+            for i, (m, c, m2) in enumerate(islice(zip(batch, cipher, decrypted), max(sisa, 0))):
+                nomor = hasil['jumlah'] + i + 1
+                hasil['encryption_data'].append(baris_enkripsi(m, c, e, n, mode, nomor))
+                hasil['decryption_data'].append(baris_dekripsi(c, m2, d, n, mode))
+            hasil['jumlah'] += len(batch)
+            
+            plain_file.write(text_decoder.feed(decrypted).encode('utf-8'))
+            biner_file.write(pack_values(cipher, lebar))
+            yield cipher
+    
+    write_cipher_text(cipher_file, cipher_batches(), e, n, mode)
+    plain_file.write(text_decoder.finish().encode('utf-8'))
+    for f in (cipher_file, biner_file, plain_file):
+        f.flush()
+    return cipher_file, biner_file, plain_file, hasil
+
+# Dekripsi langsung file ciphertext biner (.rsac) per potongan; plaintext ditulis ke file sementara
+def dekripsi_container_stream(fileobj, d, n, private_key):
+    fileobj.seek(0)
+    reader = ContainerReader(read_chunks(fileobj))
+    reader.check_key(n)
+    plain_file = tempfile.NamedTemporaryFile(prefix='rsa_plain_', suffix='.txt')
+    text_decoder = BatchTextDecoder(n, reader.mode)
+    jumlah = 0
+    paralel = use_parallel(getattr(fileobj, 'size', 0) // reader.width)
+    for batch in map_ordered(decrypt_batch, ((b, d, n, private_key) for b in reader), paralel):
+        plain_file.write(text_decoder.feed(batch).encode('utf-8', errors='replace'))
+        jumlah += len(batch)
+    plain_file.write(text_decoder.finish().encode('utf-8', errors='replace'))
+    plain_file.flush()
+    return plain_file, {'jumlah': jumlah, 'mode': reader.mode, 'n_bits': reader.n_bits,
+                        'key_id': reader.key_id.hex()}
+
+# Batas cache tiap tahap pipeline (jumlah entri dan masa berlaku), bisa diatur lewat environment
+CACHE_MAX_ENTRIES = int(os.environ.get("RSA_CACHE_MAX_ENTRIES", 64))
+CACHE_MAX_FILES = int(os.environ.get("RSA_CACHE_MAX_FILES", 4))
+CACHE_TTL = os.environ.get("RSA_CACHE_TTL", "1h")
+
+# Tahap 1: turunan kunci dari p, q, e (gcd, d, dan kunci privat CRT)
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def turunkan_kunci(p, q, e):
+    phi = (p - 1) * (q - 1)
+    faktor = gcd(e, phi)
+    if faktor != 1:
+        return {'gcd': faktor, 'd': None, 'private_key': None}
+    with metrics.stage("mod_inverse"):
+        d = mod_inverse(e, phi)
+    return {'gcd': faktor, 'd': d, 'private_key': make_private_key(p, q, d)}
+
+# Tahap 2: enkripsi pesan (tanpa baris tabel langkah; tabel dibangun per halaman di tahap 4)
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner="Mengenkripsi pesan...")
+def enkripsi_pesan(pesan, e, n, support_all_chars, mode):
+    return encrypt_text(pesan, e, n, support_all_chars, mode, steps=False)
+
+# Tahap 3: dekripsi. Ciphertext dan kunci privat ditentukan oleh (pesan, e, d, n, mode),
+# jadi argumen berawalan _ tidak perlu di-hash
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner="Mendekripsi pesan...")
+def dekripsi_pesan(pesan, e, d, n, mode, _cipher_numbers, _private_key):
+    return decrypt_text(_cipher_numbers, d, n, _private_key, mode, steps=False)
+
+# Isi file download ciphertext (dibangun sekali per pesan dan kunci, bukan setiap rerun). Urutan
+# baris sama dengan stream.write_cipher_text (kunci dan mode sebelum angka) agar CLI bisa membacanya.
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def file_ciphertext(pesan, e, n, support_all_chars, mode):
+    cipher_numbers, cipher_letters, _ = enkripsi_pesan(pesan, e, n, support_all_chars, mode)
+    return '\n'.join([
+        "=== RSA Encrypted Message ===",
+        f"Public Key (e, n): ({e}, {n})",
+        f"Mode: {mode}",
+        f"Ciphertext (numbers): {cipher_numbers}",
+        f"Ciphertext (letters): {''.join(cipher_letters)}",
+        ""
+    ])
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def file_ciphertext_biner(pesan, e, n, support_all_chars, mode):
+    cipher_numbers = enkripsi_pesan(pesan, e, n, support_all_chars, mode)[0]
+    return pack_header(n, mode) + pack_values(cipher_numbers, value_width(n))
+
+# Tahap 4: satu halaman tabel langkah enkripsi dan dekripsi
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def tabel_enkripsi(pesan, e, n, support_all_chars, mode, halaman=1):
+    cipher_numbers = enkripsi_pesan(pesan, e, n, support_all_chars, mode)[0]
+    awal = (halaman - 1) * BARIS_PER_HALAMAN
+    return buat_dataframe(langkah_enkripsi(pesan, cipher_numbers, e, n, mode, awal, awal + BARIS_PER_HALAMAN))
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def tabel_dekripsi(pesan, e, d, n, mode, _cipher_numbers, _private_key, halaman=1):
+    decrypted_numbers = dekripsi_pesan(pesan, e, d, n, mode, _cipher_numbers, _private_key)[0]
+    awal = (halaman - 1) * BARIS_PER_HALAMAN
+    return buat_dataframe(langkah_dekripsi(_cipher_numbers, decrypted_numbers, d, n, mode,
+                                           awal, awal + BARIS_PER_HALAMAN))
+
+# Hasil file upload disimpan sebagai resource (file sementara + preview) per file dan kunci
+@st.cache_resource(max_entries=CACHE_MAX_FILES, ttl=CACHE_TTL, show_spinner="Memproses file...")
+def proses_file_cached(file_id, e, d, n, mode, _fileobj, _private_key):
+    cipher_file, biner_file, plain_file, hasil = proses_file_stream(_fileobj, e, d, n, _private_key, mode)
+    hasil['df_encryption'] = buat_dataframe(hasil['encryption_data'])
+    hasil['df_decryption'] = buat_dataframe(hasil['decryption_data'])
+    return cipher_file, biner_file, plain_file, hasil
+
+@st.cache_resource(max_entries=CACHE_MAX_FILES, ttl=CACHE_TTL, show_spinner="Mendekripsi file...")
+def dekripsi_container_cached(file_id, d, n, _fileobj, _private_key):
+    return dekripsi_container_stream(_fileobj, d, n, _private_key)
+
+# Tabel CSV batch, di-parse sekali per upload (file_id) dan bukan setiap rerun
+@st.cache_data(max_entries=CACHE_MAX_FILES, ttl=CACHE_TTL, show_spinner="Membaca CSV...")
+def baca_csv_batch(file_id, _fileobj):
+    _fileobj.seek(0)
+    return pd.read_csv(_fileobj, dtype=str, keep_default_na=False)
+
+# Mode batch: satu panggilan encrypt_rows untuk semua baris (dikelompokkan per kunci, paralel).
+# Hasil di-cache per input (batch_id), jadi rerun UI tidak mengenkripsi ulang; _buat_baris
+# hanya dipanggil saat cache kosong. _store None jika input tidak memakai key_id.
+@st.cache_resource(max_entries=CACHE_MAX_FILES, ttl=CACHE_TTL, show_spinner="Mengenkripsi batch...")
+def enkripsi_batch(batch_id, mode, kolom_pesan, _buat_baris, _store=None):
+    hasil = encrypt_rows(_buat_baris(), mode, _store, kolom_pesan)
+    arsip = io.BytesIO()
+    write_archive(hasil, arsip)
+    return {
+        'hasil': hasil,
+        'csv': pd.DataFrame(result_rows(hasil)).to_csv(index=False),
+        'zip': arsip.getvalue(),
+        'df_preview': buat_dataframe(islice(result_rows(hasil, cipher=False), PREVIEW_ROWS)),
+    }
+
+# True jika file upload adalah container ciphertext biner (diawali magic RSAC)
+def adalah_container(uploaded_file):
+    uploaded_file.seek(0)
+    kepala = uploaded_file.read(4)
+    uploaded_file.seek(0)
+    return is_container(kepala)
 
-# Dekripsi teks
-def decrypt_text(cipher_numbers, d, n):
-    decrypted_numbers = []
-    decrypted_letters = []
-    decryption_data = []
+# Download file hasil yang besar. st.download_button memuat seluruh isi file ke memori server
+# setiap rerun (Streamlit 1.50 belum mendukung data yang dibuat saat tombol diklik), jadi file
+# baru dibaca setelah pengguna memilihnya dan menekan "Siapkan download", dan hanya file itu.
+# file_hasil: label -> (path, nama file download, mime)
+def download_file_hasil(file_hasil, key):
+    siap = f"{key}_siap"
+    label = st.radio("File hasil", list(file_hasil), key=f"{key}_pilih", horizontal=True)
+    path, file_name, mime = file_hasil[label]
+    if st.button("Siapkan download", key=f"{key}_siapkan"):
+        st.session_state[siap] = path
+    # path file sementara unik per hasil, jadi file lama tidak ikut termuat setelah input berubah
+    if st.session_state.get(siap) != path:
+        return
+    with open(path, 'rb') as data:
+        st.download_button(
+            label=f"📥 Download {label}",
+            data=data,
+            file_name=file_name,
+            mime=mime,
+            key=f"{key}_download",
+            # setelah diunduh, file tidak dimuat lagi pada rerun berikutnya
+            on_click=lambda: st.session_state.pop(siap, None)
+        )
+
+# Tampilan hasil untuk file upload: preview tabel, download ciphertext/plaintext, dan verifikasi
+def tampilkan_file_stream(uploaded_file, e, d, n, private_key, mode):
+    st.subheader("Proses Enkripsi & Dekripsi File")
+    langkah = "Blok" if mode == MODE_BLOK else "Karakter"
     
-    for cipher_num in cipher_numbers:
-        decrypted_num = mod_exp(cipher_num, d, n)
-        decrypted_letter = chr(decrypted_num)
-        
-        decryption_data.append({
-            'Cipher (c)': cipher_num,
-            f'c^{d} mod {n}': decrypted_num,
-            'ASCII ke Karakter': decrypted_letter if decrypted_letter != ' ' else '␣'
-        })
-        
-        decrypted_numbers.append(decrypted_num)
-        decrypted_letters.append(decrypted_letter)
+    cipher_file, biner_file, plain_file, hasil = proses_file_cached(uploaded_file.file_id, e, d, n, mode,
+                                                                    uploaded_file, private_key)
+    st.info(f"File diproses per potongan: {hasil['jumlah']} {langkah.lower()} dienkripsi. "
+            f"Tabel hanya menampilkan {len(hasil['encryption_data'])} {langkah.lower()} pertama.")
+    
+    st.write(f"**Langkah Enkripsi per {langkah} (preview):**")
+    st.dataframe(hasil['df_encryption'], width=800)
+    st.write(f"**Langkah Dekripsi per {langkah} (preview):**")
+    st.dataframe(hasil['df_decryption'], width=800)
+    
+    download_file_hasil({
+        "Ciphertext (teks)": (cipher_file.name, "encrypted.txt", "text/plain"),
+        f"Ciphertext biner ({EXTENSION})": (biner_file.name, f"encrypted{EXTENSION}", "application/octet-stream"),
+        "Plaintext": (plain_file.name, "decrypted.txt", "text/plain"),
+    }, key="file_stream")
+    st.caption(f"Ciphertext biner {EXTENSION} memakai format ringkas (nilai big-endian lebar tetap) "
+               "dan bisa di-upload kembali untuk didekripsi.")
     
-    return decrypted_numbers, decrypted_letters, decryption_data
+    if hasil['cocok']:
+        st.success("✅ Dekripsi berhasil! Pesan asli berhasil dipulihkan.")
+    else:
+        st.error("❌ Terjadi kesalahan dalam proses enkripsi/dekripsi.")
+        if mode == MODE_KARAKTER:
+            st.warning(f"⚠️ Kemungkinan ada karakter dengan kode ≥ n = {n}. Gunakan p dan q yang lebih besar atau mode blok.")
 
-def main():
+# Tampilan dekripsi untuk file ciphertext biner (.rsac) yang di-upload
+def tampilkan_dekripsi_container(uploaded_file, d, n, private_key):
+    st.subheader("Dekripsi File Ciphertext Biner")
+    try:
+        plain_file, info = dekripsi_container_cached(uploaded_file.file_id, d, n, uploaded_file, private_key)
+    except ValueError as ex:
+        st.error(f"❌ {ex}")
+        # file dibuat untuk kunci lain: beri tahu jika kunci itu ada di penyimpanan
+        uploaded_file.seek(0)
+        store = buka_penyimpanan_kunci()
+        try:
+            tersimpan = store and store.get(ContainerReader([uploaded_file.read(HEADER.size)]).key_id)
+        except ValueError:
+            tersimpan = None
+        if tersimpan is not None:
+            st.info(f"Kunci untuk file ini ada di penyimpanan (key id {tersimpan.id}). "
+                    "Muat lewat 'Muat kunci tersimpan' untuk mendekripsinya.")
+        return
+    langkah = "blok" if info['mode'] == MODE_BLOK else "karakter"
+    st.info(f"Mode {info['mode']}, modulus {info['n_bits']} bit, key id {info['key_id']}: "
+            f"{info['jumlah']} {langkah} didekripsi.")
+    st.write("**Plaintext (preview):**")
+    with open(plain_file.name, 'rb') as data:
+        preview = data.read(PREVIEW_BYTES).decode('utf-8', errors='ignore')
+    st.code(preview + ('...' if os.path.getsize(plain_file.name) > PREVIEW_BYTES else ''), language=None)
+    download_file_hasil({"Plaintext": (plain_file.name, "decrypted.txt", "text/plain")}, key="file_container")
+
+# Muat p, q, e dari penyimpanan kunci berdasarkan key id (nilai dipakai sebagai default input)
+def tampilkan_muat_kunci():
+    with st.expander("Muat kunci tersimpan"):
+        st.caption(f"Penyimpanan kunci: {os.path.abspath(DEFAULT_PATH)}")
+        kid = st.text_input("Key id (16 digit hex)", key="muat_key_id",
+                            help="Id ditampilkan saat kunci disimpan; sama dengan key id di file .rsac")
+        if st.button("Muat kunci", disabled=not kid):
+            store = buka_penyimpanan_kunci()
+            if store is None:
+                return
+            try:
+                tersimpan = store.load(kid)
+            except KeyError:
+                st.error(f"❌ Kunci {kid.strip()} tidak ditemukan")
+            except ValueError as ex:
+                st.error(f"❌ {ex}")
+            else:
+                st.session_state.random_p = tersimpan.keypair.p
+                st.session_state.random_q = tersimpan.keypair.q
+                st.session_state.random_e = tersimpan.keypair.e
+                st.rerun()
+
+# Simpan kunci aktif (beserta komponen CRT) ke penyimpanan kunci
+def tampilkan_simpan_kunci(p, q, n, e, d):
+    with st.expander("💾 Simpan kunci ini"):
+        label = st.text_input("Label (opsional)", key="label_kunci")
+        if st.button("Simpan ke penyimpanan kunci"):
+            try:
+                kid = get_key_store().save(KeyPair(p, q, n, e, d), label=label)
+            except (OSError, ValueError) as ex:
+                st.error(f"❌ Gagal menyimpan kunci: {ex}")
+            else:
+                st.success(f"✅ Kunci disimpan dengan key id **{kid}**")
+        st.caption("Kunci privat (d, p, q) disimpan tanpa enkripsi di disk; gunakan hanya untuk latihan.")
+
+# Input batch: CSV (kolom pesan + key_id atau n/e per baris) atau beberapa file .txt untuk
+# beberapa kunci tersimpan (setiap file untuk setiap kunci)
+def tampilkan_batch():
+    with st.expander("📦 Mode batch: banyak pesan untuk banyak kunci"):
+        st.caption("Baris dikelompokkan per kunci publik sehingga prakomputasi tiap kunci dipakai ulang, "
+                   "lalu kelompok diproses paralel. Hasil: CSV (ciphertext per baris) atau ZIP berisi "
+                   f"satu file {EXTENSION} per baris.")
+        sumber = st.radio("Sumber batch:", ["Tabel CSV", "File .txt"], horizontal=True, key="batch_sumber")
+        mode = MODE_BLOK if st.radio("Mode batch:", ["Blok", "Per karakter"], horizontal=True,
+                                     key="batch_mode") == "Blok" else MODE_KARAKTER
+        if sumber == "Tabel CSV":
+            tabel = st.file_uploader("CSV dengan kolom pesan dan key_id atau n (+ e, default 65537)", type=["csv"],
+                                     key="batch_csv")
+            if tabel is None:
+                return
+            df = baca_csv_batch(tabel.file_id, tabel)
+            kolom = list(df.columns)
+            if not {"key_id", "n"} & set(kolom):
+                st.error("❌ CSV harus memiliki kolom key_id atau n")
+                return
+            # default: kolom "message", atau kolom pertama yang bukan kolom kunci/nama
+            calon = ["message"] + [nama for nama in kolom if nama not in ("key_id", "n", "e", "name")]
+            kolom_pesan = st.selectbox("Kolom pesan:", kolom, index=kolom.index(next(
+                (nama for nama in calon if nama in kolom), kolom[0])))
+            # penyimpanan kunci hanya dibuka jika ada kolom key_id; tanpa penyimpanan, baris key_id gagal
+            store = buka_penyimpanan_kunci() if "key_id" in kolom else None
+            batch_id = (tabel.file_id,)
+            buat_baris = lambda: df.to_dict("records")
+        else:
+            files = st.file_uploader("File teks", type=["txt"], accept_multiple_files=True, key="batch_files")
+            # penerima dipilih lewat key id; hanya kunci yang dipilih yang dibaca dari penyimpanan
+            teks_penerima = st.text_area("Key id penerima (satu per baris):", key="batch_penerima",
+                                         help="Id tampil saat kunci disimpan")
+            penerima = list(dict.fromkeys(baris.strip().lower() for baris in teks_penerima.splitlines() if baris.strip()))
+            if not files or not penerima:
+                return
+            store = buka_penyimpanan_kunci()
+            if store is None:
+                return
+            try:
+                tidak_ada = [kid for kid in penerima if kid not in store]
+            except ValueError as ex:
+                st.error(f"❌ {ex}")
+                return
+            if tidak_ada:
+                st.error(f"❌ Kunci tidak ada di penyimpanan: {', '.join(tidak_ada)}")
+                return
+            label = [store.load(kid).label for kid in penerima]
+            st.caption("Penerima: " + ", ".join(f"{kid} ({nama})" if nama else kid for kid, nama in zip(penerima, label)))
+            kolom_pesan = "message"
+            batch_id = (tuple(f.file_id for f in files), tuple(penerima))
+            buat_baris = lambda: cross_records(((f.name, f.getvalue().decode("utf-8", errors="replace"))
+                                                for f in files), [{"key_id": kid} for kid in penerima])
+        with metrics.stage("batch"):
+            hasil = enkripsi_batch(batch_id, mode, kolom_pesan, buat_baris, store)
+        gagal = [baris for baris in hasil['hasil'] if baris['error']]
+        jumlah_kunci = len({baris['key_id'] for baris in hasil['hasil'] if not baris['error']})
+        st.success(f"✅ {len(hasil['hasil']) - len(gagal)} baris dienkripsi untuk {jumlah_kunci} kunci")
+        if gagal:
+            st.warning(f"⚠️ {len(gagal)} baris gagal, mis. baris {gagal[0]['row']}: {gagal[0]['error']}")
+        st.dataframe(hasil['df_preview'], hide_index=True)
+        if len(hasil['hasil']) > PREVIEW_ROWS:
+            st.caption(f"Menampilkan {PREVIEW_ROWS} dari {len(hasil['hasil'])} baris; hasil lengkap lewat download.")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("📥 Hasil CSV", hasil['csv'], file_name="hasil_batch.csv", mime="text/csv")
+        with col2:
+            st.download_button(f"📥 Arsip ZIP ({EXTENSION} + manifest)", hasil['zip'], file_name="hasil_batch.zip",
+                               mime="application/zip")
+
+# Statistik cache eksponensiasi untuk kunci aktif (akumulatif di semua rerun)
+def tampilkan_statistik_cache(e, d, n):
+    with st.expander("Statistik cache eksponensiasi"):
+        for label, exp in (("Enkripsi (e)", e), ("Dekripsi (d)", d)):
+            stats = expcache.cache_stats(exp, n)
+            if stats is None:
+                continue
+            jenis = "tabel lengkap" if stats['full_table'] else "LRU"
+            st.write(f"**{label}:** {stats['hits']} hit, {stats['misses']} miss, {stats['size']} entri ({jenis})"
+                     + (f", {stats['vectorized']} nilai lewat NumPy" if stats['vectorized'] else ""))
+        st.caption("Untuk n kecil seluruh tabel m → m^e mod n dihitung sekali (dihitung sebagai miss); "
+                   "setiap karakter berikutnya hanya membaca tabel. Cache dibuang saat p, q, atau e berubah.")
+
+def halaman():
     st.title("RSA Encryption/Decryption Calculator")
     st.markdown("---")
     
@@ -111,12 +508,35 @@ def main():
     
     # Generator bilangan prima
     st.subheader("Generator Bilangan Prima")
+    ukuran = st.selectbox("Ukuran bilangan prima:", list(UKURAN_PRIMA),
+                          help="Ukuran p dan q yang dibuat generator. Ukuran besar hanya bisa diedit sebagai teks")
+    bits = UKURAN_PRIMA[ukuran]
+    if bits is not None:
+        # Modulus n = p × q berukuran dua kali ukuran prima; pool mulai diisi sejak ukuran dipilih
+        key_pool = get_key_pool()
+        key_pool.refill(2 * bits)
     if st.button("Buat angka prima acak", help="Klik untuk membuat bilangan prima p dan q secara acak"):
-        st.session_state.random_p = generate_random_prime(10, 100)
-        st.session_state.random_q = generate_random_prime(10, 100)
-        while st.session_state.random_q == st.session_state.random_p:
+        if bits is None:
+            st.session_state.random_p = generate_random_prime(10, 100)
             st.session_state.random_q = generate_random_prime(10, 100)
+            while st.session_state.random_q == st.session_state.random_p:
+                st.session_state.random_q = generate_random_prime(10, 100)
+        else:
+            with metrics.stage("key_pool"):
+                key = key_pool.get(2 * bits)
+            st.session_state.random_p = key.p
+            st.session_state.random_q = key.q
         st.success(f"✨ Generated: p={st.session_state.random_p}, q={st.session_state.random_q}")
+    if bits is not None:
+        with st.expander("Status pool kunci"):
+            pool_stats = key_pool.stats()
+            if pool_stats:
+                df_pool = pd.DataFrame.from_dict(pool_stats, orient="index")
+                df_pool.index.name = "Modulus (bit)"
+                st.dataframe(df_pool)
+            st.caption("depth = kunci siap pakai, pending = kunci yang sedang dibuat di worker, "
+                       "refill = latensi pembuatan satu kunci (detik)")
+    tampilkan_muat_kunci()
     
     # Input untuk bilangan prima p dan q
     default_p = st.session_state.get('random_p', 7)
@@ -126,15 +546,16 @@ def main():
     col1, col2 = st.columns(2)
     
     with col1:
-        p = st.number_input("Masukkan bilangan prima p:", min_value=2, value=default_p, step=1, 
+        p = input_bilangan("Masukkan bilangan prima p:", default_p,
                            help="Bilangan prima pertama untuk RSA. Contoh: 7, 11, 13, 17, 19, 23")
     with col2:
-        q = st.number_input("Masukkan bilangan prima q:", min_value=2, value=default_q, step=1,
+        q = input_bilangan("Masukkan bilangan prima q:", default_q,
                            help="Bilangan prima kedua untuk RSA. Harus berbeda dari p")
     
     # Validasi bilangan prima
-    p_is_prime = is_prime(p)
-    q_is_prime = is_prime(q)
+    with metrics.stage("is_prime"):
+        p_is_prime = is_prime(p)
+        q_is_prime = is_prime(q)
     
     col1, col2 = st.columns(2)
     with col1:
@@ -156,17 +577,34 @@ def main():
         
         # Input untuk e
         st.subheader("Eksponen Publik")
+        e_maks = min(phi - 1, MAX_NUMBER_INPUT)
+        e_default = min(65537, phi-1) if phi > 65537 else min(17, phi-1)
+        # e dari kunci yang dimuat dari penyimpanan, jika masih valid untuk p dan q ini
+        e_tersimpan = st.session_state.get('random_e')
+        if e_tersimpan is not None and 2 <= e_tersimpan <= e_maks:
+            e_default = e_tersimpan
         e = st.number_input(f"Masukkan nilai e (1 < e < {phi}, relatif prima dengan φ):", 
-                           min_value=2, max_value=phi-1, value=min(65537, phi-1) if phi > 65537 else min(17, phi-1), step=1,
+                           min_value=2, max_value=e_maks, value=e_default, step=1,
                            help="Eksponen enkripsi publik. Nilai umum: 3, 17, 257, 65537")
         
-        # Validasi e
-        if gcd(e, phi) == 1:
+        # Validasi e dan hitung d (hasilnya di-cache per p, q, e)
+        with metrics.stage("turunkan_kunci"):
+            kunci = turunkan_kunci(p, q, e)
+        if kunci['gcd'] == 1:
             st.success(f"✅ e = {e} relatif prima dengan φ = {phi}")
             
             # Hitung d
             try:
-                d = mod_inverse(e, phi)
+                d = kunci['d']
+                private_key = kunci['private_key']
+                
+                # Cache eksponensiasi berlaku per kunci; buang cache kunci sebelumnya jika p, q, atau e berubah
+                kunci_lama = st.session_state.get('kunci_cache')
+                if kunci_lama is not None and kunci_lama != (e, d, n):
+                    e_lama, d_lama, n_lama = kunci_lama
+                    expcache.invalidate(e_lama, n_lama)
+                    expcache.invalidate(d_lama, n_lama)
+                st.session_state.kunci_cache = (e, d, n)
                 
                 # Tampilkan hasil kunci
                 st.header("Kunci RSA yang Dihasilkan")
@@ -204,8 +642,7 @@ def main():
                         st.write("**Edit bilangan prima:**")
                         
                         # Input p
-                        new_p = st.number_input("**p** (bilangan prima):", 
-                                               min_value=2, value=p, step=1, 
+                        new_p = input_bilangan("**p** (bilangan prima):", p,
                                                key="edit_p",
                                                help="Masukkan bilangan prima pertama")
                         if new_p != p:
@@ -217,8 +654,7 @@ def main():
                                 st.error(f"❌ {new_p} bukan bilangan prima!")
                         
                         # Input q
-                        new_q = st.number_input("**q** (bilangan prima):", 
-                                               min_value=2, value=q, step=1,
+                        new_q = input_bilangan("**q** (bilangan prima):", q,
                                                key="edit_q",
                                                help="Masukkan bilangan prima kedua (harus berbeda dari p)")
                         if new_q != q:
@@ -274,7 +710,7 @@ def main():
                         st.write("**Edit eksponen publik e:**")
                         
                         new_e = st.number_input(f"**e** (relatif prima dengan φ={phi}):", 
-                                               min_value=2, max_value=phi-1, value=e, step=1,
+                                               min_value=2, max_value=min(phi-1, MAX_NUMBER_INPUT), value=e, step=1,
                                                key="edit_e",
                                                help="Eksponen enkripsi publik. Nilai umum: 3, 17, 257, 65537")
                         
@@ -319,6 +755,16 @@ def main():
                             st.write(f"- {e} × {d} = {e*d}")
                             st.write(f"- Dapat dibagikan: Public Key (e, n)")
                             st.write(f"- Harus dirahasiakan: Private Key (d, n)")
+                            st.write("**Komponen CRT (untuk dekripsi cepat):**")
+                            if private_key is None:
+                                st.write("- CRT tidak dipakai karena p atau q = 2 (d mod 1 = 0); "
+                                         "dekripsi memakai c^d mod n")
+                            else:
+                                st.write(f"- dp = d mod (p-1) = {private_key.dp}")
+                                st.write(f"- dq = d mod (q-1) = {private_key.dq}")
+                                st.write(f"- qinv = q⁻¹ mod p = {private_key.qinv}")
+                    
+                    tampilkan_simpan_kunci(p, q, n, e, d)
                 
                 st.markdown("---")
                 
@@ -348,15 +794,35 @@ def main():
                             pesan = pesan_filtered
                 else:
                     # File upload
-                    uploaded_file = st.file_uploader("Upload file teks:", type=['txt'], 
-                                                     help="Upload file .txt untuk dienkripsi")
-                    if uploaded_file is not None:
-                        pesan = uploaded_file.read().decode('utf-8')
-                        st.info(f"File loaded: {len(pesan)} karakter")
+                    uploaded_file = st.file_uploader("Upload file teks:", type=['txt', EXTENSION.lstrip('.')], 
+                                                     help=f"Upload file .txt untuk dienkripsi, atau file {EXTENSION} "
+                                                          f"(ciphertext biner) untuk didekripsi langsung")
+                    if uploaded_file is not None and adalah_container(uploaded_file):
+                        st.info(f"File ciphertext biner: {uploaded_file.size} byte, didekripsi dengan kunci privat saat ini")
+                    elif uploaded_file is not None:
+                        st.info(f"File loaded: {uploaded_file.size} byte")
                         with st.expander("Preview pesan dari file"):
-                            st.text(pesan[:500] + ('...' if len(pesan) > 500 else ''))
+                            uploaded_file.seek(0)
+                            preview = uploaded_file.read(PREVIEW_BYTES).decode('utf-8', errors='ignore')
+                            st.text(preview + ('...' if uploaded_file.size > PREVIEW_BYTES else ''))
                     support_all_chars = True
                 
+                # Mode enkripsi
+                k_blok = block_size(n)
+                if k_blok >= 1:
+                    mode_label = st.radio("Mode Enkripsi:", ["Per karakter", "Blok"], horizontal=True,
+                                          index=1 if input_mode == "File Upload" else 0,
+                                          help=f"Mode blok mengemas hingga {k_blok} byte UTF-8 per blok sehingga "
+                                               f"jumlah eksponensiasi berkurang {k_blok}×")
+                    mode = MODE_BLOK if mode_label == "Blok" else MODE_KARAKTER
+                else:
+                    mode = MODE_KARAKTER
+                    st.caption(f"Mode blok membutuhkan n ≥ 256 (n saat ini = {n}); pesan dienkripsi per karakter.")
+                
+                if pesan and mode == MODE_KARAKTER and max(map(ord, pesan)) >= n:
+                    st.warning(f"⚠️ Ada karakter dengan kode ≥ n = {n}, sehingga karakter tersebut tidak bisa "
+                               f"dipulihkan. Gunakan p dan q yang lebih besar atau mode blok.")
+                
                 if pesan:
                     # Enkripsi
                     st.subheader("Proses Enkripsi")
@@ -372,45 +838,42 @@ def main():
                         Ciphertext yang dihasilkan aman karena sangat sulit menghitung akar pangkat e mod n tanpa mengetahui kunci privat d.
                         """)
                     
-                    cipher_numbers, cipher_letters, encryption_data = encrypt_text(pesan, e, n, support_all_chars)
+                    with metrics.stage("enkripsi_pesan"):
+                        cipher_numbers, cipher_letters, _ = enkripsi_pesan(pesan, e, n, support_all_chars, mode)
                     
                     # Tampilkan tabel enkripsi
-                    if len(pesan) <= 50:
-                        st.write("**Langkah per Karakter:**")
-                        df_encryption = pd.DataFrame(encryption_data)
-                        st.dataframe(df_encryption, width=800)
-                    else:
-                        st.info(f"Pesan terlalu panjang ({len(pesan)} karakter) untuk ditampilkan dalam tabel detail.")
-                        with st.expander("Lihat detail enkripsi"):
-                            df_encryption = pd.DataFrame(encryption_data)
-                            st.dataframe(df_encryption, width=800)
+                    langkah = "Blok" if mode == MODE_BLOK else "Karakter"
+                    tampilkan_tabel_langkah(len(cipher_numbers), langkah, "enkripsi",
+                                            lambda halaman: tabel_enkripsi(pesan, e, n, support_all_chars, mode, halaman))
                     
                     st.write("**Hasil Enkripsi:**")
                     col1, col2 = st.columns(2)
                     with col1:
                         st.write(f"**Ciphertext (angka):**")
-                        st.code(str(cipher_numbers), language=None)
+                        st.code(ringkas_daftar(cipher_numbers), language=None)
                     with col2:
                         st.write(f"**Ciphertext (huruf):**")
                         cipher_text = ''.join(cipher_letters)
-                        st.code(cipher_text, language=None)
+                        st.code(ringkas_teks(cipher_text), language=None)
                     
                     # Download hasil enkripsi
                     col1, col2 = st.columns(2)
                     with col1:
-                        cipher_text_file = '\n'.join([
-                            "=== RSA Encrypted Message ===",
-                            f"Ciphertext (numbers): {cipher_numbers}",
-                            f"Ciphertext (letters): {cipher_text}",
-                            f"Public Key (e, n): ({e}, {n})",
-                            ""
-                        ])
+                        cipher_text_file = file_ciphertext(pesan, e, n, support_all_chars, mode)
                         st.download_button(
                             label="📥 Download Ciphertext",
                             data=cipher_text_file,
                             file_name="encrypted.txt",
                             mime="text/plain"
                         )
+                    with col2:
+                        st.download_button(
+                            label=f"📥 Ciphertext biner ({EXTENSION})",
+                            data=file_ciphertext_biner(pesan, e, n, support_all_chars, mode),
+                            file_name=f"encrypted{EXTENSION}",
+                            mime="application/octet-stream",
+                            help="Format ringkas (nilai big-endian lebar tetap); bisa di-upload kembali untuk didekripsi"
+                        )
                     
                     # Proses Dekripsi
                     st.subheader("Proses Dekripsi")
@@ -427,27 +890,23 @@ def main():
                         Hanya pemilik kunci privat d yang dapat mendekripsi pesan dengan benar.
                         """)
                     
-                    decrypted_numbers, decrypted_letters, decryption_data = decrypt_text(cipher_numbers, d, n)
+                    with metrics.stage("dekripsi_pesan"):
+                        decrypted_numbers, decrypted_letters, _ = dekripsi_pesan(pesan, e, d, n, mode, cipher_numbers,
+                                                                                 private_key)
                     
-                    if len(pesan) <= 50:
-                        st.write("**Langkah per Karakter:**")
-                        df_decryption = pd.DataFrame(decryption_data)
-                        st.dataframe(df_decryption, width=800)
-                    else:
-                        st.info(f"Pesan terlalu panjang ({len(pesan)} karakter) untuk ditampilkan dalam tabel detail.")
-                        with st.expander("Lihat detail dekripsi"):
-                            df_decryption = pd.DataFrame(decryption_data)
-                            st.dataframe(df_decryption, width=800)
+                    tampilkan_tabel_langkah(len(cipher_numbers), langkah, "dekripsi",
+                                            lambda halaman: tabel_dekripsi(pesan, e, d, n, mode, cipher_numbers,
+                                                                           private_key, halaman))
                     
                     st.write("**Hasil Dekripsi:**")
                     col1, col2 = st.columns(2)
                     with col1:
                         st.write(f"**Plaintext (ASCII):**")
-                        st.code(str(decrypted_numbers), language=None)
+                        st.code(ringkas_daftar(decrypted_numbers), language=None)
                     with col2:
                         st.write(f"**Plaintext (teks):**")
                         decrypted_text = ''.join(decrypted_letters)
-                        st.code(decrypted_text, language=None)
+                        st.code(ringkas_teks(decrypted_text), language=None)
                     
                     # Download hasil dekripsi
                     with col2:
@@ -464,6 +923,8 @@ def main():
                     else:
                         st.error("❌ Terjadi kesalahan dalam proses enkripsi/dekripsi.")
                     
+                    tampilkan_statistik_cache(e, d, n)
+                    
                     # Penjelasan matematis
                     st.markdown("---")
                     st.subheader("Penjelasan Matematis")
@@ -485,15 +946,27 @@ def main():
                         st.write(f"- Verifikasi: {e} × {d} ≡ 1 (mod {phi})")
                         st.write(f"- Hasil: {e} × {d} = {e*d}, {e*d} mod {phi} = {(e*d) % phi}")
                     
+                elif input_mode == "File Upload" and uploaded_file is not None and adalah_container(uploaded_file):
+                    with metrics.stage("file"):
+                        tampilkan_dekripsi_container(uploaded_file, d, n, private_key)
+                    tampilkan_statistik_cache(e, d, n)
+                elif input_mode == "File Upload" and uploaded_file is not None:
+                    with metrics.stage("file"):
+                        tampilkan_file_stream(uploaded_file, e, d, n, private_key, mode)
+                    tampilkan_statistik_cache(e, d, n)
+                    
             except Exception as ex:
                 st.error(f"Error menghitung private key: {str(ex)}")
                 
         else:
-            st.error(f"❌ e = {e} tidak relatif prima dengan φ = {phi} (GCD = {gcd(e, phi)})")
+            st.error(f"❌ e = {e} tidak relatif prima dengan φ = {phi} (GCD = {kunci['gcd']})")
     
     elif p == q:
         st.error("❌ p dan q tidak boleh sama!")
     
+    st.markdown("---")
+    tampilkan_batch()
+    
     # Informasi tambahan
     st.markdown("---")
     st.info("""
@@ -505,5 +978,46 @@ def main():
     - Gunakan generator untuk coba berbagai kombinasi
     """)
 
+# Panel sidebar: rincian tahap rerun ini, ekspor Prometheus/JSON, dan laporan cProfile
+def tampilkan_panel_metrik(run, hasil_profil):
+    st.sidebar.subheader("Rincian waktu rerun ini")
+    baris = [{"Tahap": nama, "Panggilan": entry["calls"], "Waktu (ms)": entry["seconds"] * 1e3,
+              "Bersarang": "ya" if entry["nested"] else ""}
+             for nama, entry in run["stages"].items()]
+    baris.append({"Tahap": "lain-lain (render)", "Panggilan": 1, "Waktu (ms)": run["unmeasured_s"] * 1e3,
+                  "Bersarang": ""})
+    st.sidebar.dataframe(pd.DataFrame(baris), hide_index=True)
+    st.sidebar.caption(f"Total {run['total_s'] * 1e3:.1f} ms. Tahap bersarang (mis. encrypt_text di dalam "
+                       "enkripsi_pesan) sudah termasuk dalam tahap induknya; tahap yang tidak muncul "
+                       "dilayani dari cache.")
+    st.sidebar.download_button("Ekspor Prometheus", metrics.to_prometheus(), file_name="rsa_metrics.txt",
+                               mime="text/plain")
+    st.sidebar.download_button("Ekspor JSON", json.dumps({"run": run, "total": metrics.snapshot()}, indent=2),
+                               file_name="rsa_metrics.json", mime="application/json")
+    if hasil_profil is not None:
+        with st.sidebar.expander("Laporan cProfile"):
+            if "error" in hasil_profil:
+                st.warning(f"cProfile tidak bisa dijalankan: {hasil_profil['error']}")
+            else:
+                st.code(hasil_profil["text"], language=None)
+
+def main():
+    with st.sidebar:
+        st.header("Instrumentasi")
+        ukur = st.checkbox("Ukur waktu per tahap", value=metrics.ENABLED,
+                           help="Catat durasi is_prime, turunan kunci, enkripsi, dekripsi, dan tabel")
+        profil = st.checkbox("Rekam cProfile", disabled=not ukur,
+                             help="Profil seluruh rerun (memperlambat halaman)")
+    if not ukur:
+        halaman()
+        return
+    metrics.start_run()
+    try:
+        with metrics.profile() if profil else nullcontext() as hasil_profil:
+            halaman()
+    finally:
+        run = metrics.finish_run()
+    tampilkan_panel_metrik(run, hasil_profil)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from rsa_core import cli
+from rsa_core.blocks import MODE_BLOK, MODE_KARAKTER
+from rsa_core.stream import BatchTextDecoder
+
+P, Q, E = 1000003, 999983, 65537
+N, D = P * Q, pow(E, -1, (P - 1) * (Q - 1))
+TEKS = "Halo dunia — ünïcode ✓\n" * 50
+
+@pytest.fixture
+def kunci(tmp_path):
+    path = tmp_path / "kunci.json"
+    path.write_text(json.dumps({"n": N, "e": E, "d": D, "p": P, "q": Q}))
+    return str(path)
+
+def _main(*argv):
+    try:
+        return cli.main(list(argv))
+    except SystemExit as exc:
+        return exc.code
+
+@pytest.mark.parametrize("mode", [MODE_BLOK, MODE_KARAKTER])
+def test_dekripsi_file_download_aplikasi(tmp_path, kunci, mode):
+    streamlit_app = pytest.importorskip("streamlit_app")
+    src = tmp_path / "encrypted.txt"
+    src.write_text(streamlit_app.file_ciphertext(TEKS, E, N, True, mode))
+    out = tmp_path / "plain.txt"
+    assert _main("decrypt", "--key", kunci, "-i", str(src), "-o", str(out)) == 0
+    assert out.read_text(encoding="utf-8") == TEKS
+
+@pytest.mark.parametrize("fmt", ["text", "lines", "binary"])
+@pytest.mark.parametrize("mode", [MODE_BLOK, MODE_KARAKTER])
+def test_round_trip(tmp_path, kunci, fmt, mode):
+    src, cipher, out = tmp_path / "pesan.txt", tmp_path / "pesan.rsa", tmp_path / "hasil.txt"
+    src.write_text(TEKS, encoding="utf-8")
+    assert _main("encrypt", "--key", kunci, "--mode", mode, "--format", fmt, "-i", str(src), "-o", str(cipher)) == 0
+    args = ["--mode", mode] if fmt == "lines" else []
+    assert _main("decrypt", "--key", kunci, *args, "-i", str(cipher), "-o", str(out)) == 0
+    assert out.read_text(encoding="utf-8") == TEKS
+
+@pytest.mark.parametrize("mode", [MODE_BLOK, MODE_KARAKTER])
+def test_kunci_salah_keluar_dengan_error(tmp_path, kunci, mode, capsys):
+    src, cipher = tmp_path / "pesan.txt", tmp_path / "pesan.txt.rsa"
+    src.write_text(TEKS, encoding="utf-8")
+    assert _main("encrypt", "--key", kunci, "--mode", mode, "--format", "lines", "-i", str(src), "-o", str(cipher)) == 0
+    p, q = 1000033, 1000037
+    salah = tmp_path / "salah.json"
+    salah.write_text(json.dumps({"n": p * q, "e": E, "d": pow(E, -1, (p - 1) * (q - 1))}))
+    assert _main("decrypt", "--key", str(salah), "--mode", mode, "-i", str(cipher), "-o", str(tmp_path / "x")) == 1
+    assert "error:" in capsys.readouterr().err
+
+def test_decoder_menolak_nilai_di_luar_rentang():
+    with pytest.raises(ValueError):
+        BatchTextDecoder(N, MODE_KARAKTER).feed([65, 0x110000])
+    with pytest.raises(ValueError):
+        BatchTextDecoder(N, MODE_BLOK).feed([N - 1])
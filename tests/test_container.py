@@ -0,0 +1,70 @@
+import io
+import random
+
+import pytest
+
+from rsa_core.blocks import MODE_BLOK, MODE_KARAKTER
+from rsa_core.container import (HEADER, ContainerReader, is_container, key_id, pack_values, unpack_values,
+                                value_width, write_container)
+
+# modulus dengan lebar nilai 1, 2, 4, 8 (lewat array) dan lebih dari 8 byte (int.from_bytes)
+MODULI = [251, 65521, 4294967291, 18446744073709551557, 2**127 - 1, 2**521 - 1]
+
+def _potong(data, sizes):
+    pos, i = 0, 0
+    while pos < len(data):
+        size = sizes[i % len(sizes)]
+        yield data[pos:pos + size]
+        pos, i = pos + size, i + 1
+
+def _values(n, count, seed=1):
+    rng = random.Random(seed)
+    return [0, 1, n - 1] + [rng.randrange(n) for _ in range(count)]
+
+@pytest.mark.parametrize("n", MODULI)
+def test_pack_unpack(n):
+    values = _values(n, 100)
+    width = value_width(n)
+    assert width >= (n.bit_length() + 7) // 8
+    data = pack_values(values, width)
+    assert len(data) == width * len(values)
+    assert unpack_values(data, width) == values
+
+@pytest.mark.parametrize("n", MODULI)
+@pytest.mark.parametrize("mode", [MODE_KARAKTER, MODE_BLOK])
+@pytest.mark.parametrize("sizes", [[1], [3], [7, 1, 20], [HEADER.size + 5], [4096]])
+def test_round_trip_lintas_batas_potongan(n, mode, sizes):
+    values = _values(n, 300)
+    out = io.BytesIO()
+    # beberapa batch, termasuk batch kosong
+    assert write_container(out, [values[:10], [], values[10:]], n, mode) == len(values)
+    data = out.getvalue()
+    assert is_container(data)
+    reader = ContainerReader(_potong(data, sizes))
+    assert (reader.mode, reader.width, reader.n_bits, reader.key_id) == (mode, value_width(n), n.bit_length(), key_id(n))
+    reader.check_key(n)
+    assert [value for batch in reader for value in batch] == values
+
+def test_kunci_lain_ditolak():
+    out = io.BytesIO()
+    write_container(out, [[1, 2, 3]], 65521, MODE_KARAKTER)
+    reader = ContainerReader([out.getvalue()])
+    with pytest.raises(ValueError):
+        reader.check_key(65519)
+
+@pytest.mark.parametrize("potong", [HEADER.size - 1, HEADER.size + 3])
+def test_file_terpotong(potong):
+    out = io.BytesIO()
+    write_container(out, [[1, 2, 3]], 4294967291, MODE_BLOK)
+    with pytest.raises(ValueError):
+        list(ContainerReader(_potong(out.getvalue()[:potong], [5])))
+
+def test_header_tidak_valid():
+    out = io.BytesIO()
+    write_container(out, [[1]], 251, MODE_BLOK)
+    data = out.getvalue()
+    assert not is_container(b"RSAX" + data[4:])
+    with pytest.raises(ValueError):
+        ContainerReader([b"XXXX" + data[4:]])
+    with pytest.raises(ValueError):
+        ContainerReader([data[:4] + b"\x02" + data[5:]])
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from rsa_core import expcache
+from rsa_core.cipher import decrypt_text, encrypt_text
+from rsa_core.keys import PrivateKey, crt_context, crt_decrypt, make_private_key
+
+# (p, q, e): termasuk p = 2 yang tidak bisa memakai CRT (d mod (p-1) = 0)
+KEYS = [(61, 53, 17), (2, 10007, 5), (10007, 2, 5), (1000003, 999983, 65537)]
+
+def _d(p, q, e):
+    return pow(e, -1, (p - 1) * (q - 1))
+
+@pytest.fixture(autouse=True)
+def bersihkan_cache():
+    expcache.clear()
+    yield
+    expcache.clear()
+
+@pytest.mark.parametrize("p, q, e", KEYS)
+def test_crt_sama_dengan_pow(p, q, e):
+    n, d = p * q, _d(p, q, e)
+    key = PrivateKey(n, d, p, q, d % (p - 1), d % (q - 1), pow(q, -1, p))
+    decrypt = crt_context(key)
+    rng = random.Random(p * q)
+    for c in [0, 1, 2, n - 1] + [rng.randrange(n) for _ in range(200)]:
+        assert crt_decrypt(c, key) == pow(c, d, n)
+        assert decrypt(c) == pow(c, d, n)
+
+def test_make_private_key_tanpa_crt_untuk_p_2():
+    assert make_private_key(2, 10007, _d(2, 10007, 5)) is None
+    assert make_private_key(10007, 2, _d(10007, 2, 5)) is None
+    key = make_private_key(61, 53, _d(61, 53, 17))
+    assert (key.dp, key.dq, key.qinv) == (key.d % 60, key.d % 52, pow(53, -1, 61))
+
+@pytest.mark.parametrize("p, q, e", KEYS)
+def test_round_trip_teks(p, q, e):
+    n, d = p * q, _d(p, q, e)
+    private_key = make_private_key(p, q, d)
+    cipher = encrypt_text("HELLO", e, n, True, steps=False)[0]
+    assert "".join(decrypt_text(cipher, d, n, private_key, steps=False)[1]) == "HELLO"
+    # hasil yang tersimpan di cache per kunci juga harus benar untuk panggilan tanpa kunci privat
+    assert "".join(decrypt_text(cipher, d, n, None, steps=False)[1]) == "HELLO"
@@ -0,0 +1,131 @@
+import os
+
+import pytest
+
+from rsa_core import backend
+from rsa_core.keys import KeyPair, generate_keypair, make_private_key
+from rsa_core.keystore import DATA_FILE, INDEX_FILE, RECORD_HEADER, KeyStore
+
+fcntl = pytest.importorskip("fcntl")
+
+@pytest.fixture(scope="module")
+def keys():
+    found = {}
+    while len(found) < 40:
+        key = generate_keypair(64)
+        found[key.n] = key
+    return list(found.values())
+
+def _isi(path, keys, **kwargs):
+    with KeyStore(path) as store:
+        return [store.save(key, label=f"k{i}", **kwargs) for i, key in enumerate(keys)]
+
+def _cek(store, keys, ids, private_keys=None):
+    assert len(store) == len(ids)
+    private_keys = private_keys or [make_private_key(key.p, key.q, key.d) for key in keys]
+    for key, private_key, kid in zip(keys, private_keys, ids):
+        stored = store.load(kid)
+        assert stored.keypair == key
+        assert stored.private_key == private_key
+
+def test_simpan_lalu_buka_ulang(tmp_path, keys):
+    path = str(tmp_path / "store")
+    ids = _isi(path, keys)
+    with KeyStore(path) as store:
+        _cek(store, keys, ids)
+        assert store.save(keys[0]) == ids[0]
+        with pytest.raises(KeyError):
+            store.load("00" * 8)
+        with pytest.raises(ValueError):
+            store.load("zz")
+
+def test_muat_tanpa_invers_modular(tmp_path, keys, monkeypatch):
+    path = str(tmp_path / "store")
+    ids = _isi(path, keys[:3])
+    private_keys = [make_private_key(key.p, key.q, key.d) for key in keys[:3]]
+
+    def gagal(*args):
+        raise AssertionError("mod_inverse dipanggil saat memuat kunci")
+    monkeypatch.setattr(backend, "mod_inverse", gagal)
+    with KeyStore(path) as store:
+        _cek(store, keys[:3], ids, private_keys)
+
+def test_kunci_dengan_p_2(tmp_path):
+    key = KeyPair(2, 10007, 20014, 5, pow(5, -1, 10006))
+    with KeyStore(str(tmp_path / "store")) as store:
+        stored = store.load(store.save(key))
+    assert stored.keypair == key and stored.private_key is None
+
+@pytest.mark.parametrize("rusak", ["hapus", "sampah"])
+def test_indeks_dibangun_ulang(tmp_path, keys, rusak):
+    path = str(tmp_path / "store")
+    ids = _isi(path, keys)
+    index_path = os.path.join(path, INDEX_FILE)
+    if rusak == "hapus":
+        os.remove(index_path)
+    else:
+        with open(index_path, "r+b") as f:
+            f.write(b"\xff" * 64)
+    with KeyStore(path) as store:
+        _cek(store, keys, ids)
+
+def test_record_rusak_di_tengah_tidak_menghapus_record_lain(tmp_path, keys):
+    path = str(tmp_path / "store")
+    ids = _isi(path, keys)
+    data_path = os.path.join(path, DATA_FILE)
+    size = os.path.getsize(data_path)
+    with KeyStore(path) as store:
+        offset = store._lookup(bytes.fromhex(ids[20]))[0]
+    # balik satu byte payload record ke-20
+    with open(data_path, "r+b") as f:
+        f.seek(offset + RECORD_HEADER.size + 3)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    os.remove(os.path.join(path, INDEX_FILE))
+    with KeyStore(path) as store:
+        assert os.path.getsize(data_path) == size
+        assert ids[20] not in store
+        rest = [i for i in range(len(keys)) if i != 20]
+        _cek(store, [keys[i] for i in rest], [ids[i] for i in rest])
+
+def test_ekor_terpotong_dibuang(tmp_path, keys):
+    path = str(tmp_path / "store")
+    ids = _isi(path, keys[:5])
+    data_path = os.path.join(path, DATA_FILE)
+    size = os.path.getsize(data_path)
+    with open(data_path, "ab") as f:
+        f.write(b"RSAK\x00\x00\x01\x00")
+    os.remove(os.path.join(path, INDEX_FILE))
+    with KeyStore(path) as store:
+        _cek(store, keys[:5], ids)
+        assert os.path.getsize(data_path) == size
+        kid = store.save(keys[5])
+    with KeyStore(path) as store:
+        _cek(store, keys[:6], ids + [kid])
+
+def test_record_belum_terindeks_ikut_dimuat(tmp_path, keys):
+    path = str(tmp_path / "store")
+    ids = _isi(path, keys[:3])
+    with open(os.path.join(path, INDEX_FILE), "rb") as f:
+        index = f.read()
+    ids += _isi(path, keys[3:6])
+    # indeks lama: tiga record terakhir belum terindeks
+    with open(os.path.join(path, INDEX_FILE), "wb") as f:
+        f.write(index)
+    with KeyStore(path) as store:
+        _cek(store, keys[:6], ids)
+
+def test_flock_tetap_dipegang_setelah_kunci_bertingkat(tmp_path):
+    with KeyStore(str(tmp_path / "store")) as store:
+        other = open(os.path.join(store.path, DATA_FILE), "rb")
+        try:
+            with store._lock, store._file_lock():
+                with store._file_lock():
+                    pass
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(other.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fcntl.flock(other.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fcntl.flock(other.fileno(), fcntl.LOCK_UN)
+        finally:
+            other.close()
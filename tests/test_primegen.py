@@ -0,0 +1,33 @@
+import random
+from collections import Counter
+
+import pytest
+
+from rsa_core.keys import generate_keypair
+from rsa_core.primality import is_prime
+from rsa_core.primegen import generate_prime, generate_random_prime
+
+PRIMA = [n for n in range(10, 100) if is_prime(n)]
+
+def test_generate_random_prime_seragam():
+    rng = random.Random(1)
+    counts = Counter(generate_random_prime(10, 100, rng) for _ in range(200 * len(PRIMA)))
+    assert sorted(counts) == PRIMA
+    # dengan offset acak + prima berikutnya, 97 muncul hampir 4x lebih sering dari 13
+    assert max(counts.values()) < 1.5 * min(counts.values())
+
+def test_generate_random_prime_tanpa_prima():
+    assert generate_random_prime(24, 29) == 7
+
+@pytest.mark.parametrize("bits", [2, 5, 11, 12, 64, 256])
+def test_generate_prime_tepat_bits(bits):
+    for _ in range(20):
+        p = generate_prime(bits)
+        assert p.bit_length() == bits and is_prime(p)
+
+@pytest.mark.parametrize("bits", [8, 9, 16, 20, 23, 24, 64])
+def test_modulus_tepat_bits(bits):
+    for _ in range(50):
+        key = generate_keypair(bits)
+        assert key.n.bit_length() == bits
+        assert key.n == key.p * key.q and key.p != key.q
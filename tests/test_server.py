@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rsa_core import server as server_module
+from rsa_core.blocks import MODE_BLOK, MODE_KARAKTER
+from rsa_core.keys import generate_keypair
+from rsa_core.server import RSAServer, ServiceClient
+
+P, Q, E = 1000003, 999983, 65537
+N, D = P * Q, pow(E, -1, (P - 1) * (Q - 1))
+
+@pytest.fixture
+def executors():
+    batch, keygen = ThreadPoolExecutor(2), ThreadPoolExecutor(1)
+    yield batch, keygen
+    batch.shutdown(cancel_futures=True)
+    keygen.shutdown(cancel_futures=True)
+
+# Jalankan fn(client, server) terhadap server di port acak
+def _jalankan(executors, fn):
+    async def main():
+        batch, keygen = executors
+        server = await RSAServer(port=0, executor=batch, keygen_executor=keygen).start()
+        client = ServiceClient(server.host, server.port)
+        try:
+            return await fn(client, server)
+        finally:
+            await client.close()
+            await server.close()
+    return asyncio.run(main())
+
+@pytest.mark.parametrize("mode", [MODE_KARAKTER, MODE_BLOK])
+def test_round_trip(executors, mode):
+    async def fn(client, server):
+        status, hasil = await client.request("POST", "/encrypt", {"n": N, "e": E, "message": "Halo ✓", "mode": mode})
+        assert status == 200
+        status, plain = await client.request("POST", "/decrypt", {"n": N, "d": D, "p": P, "q": Q,
+                                                                   "cipher": hasil["cipher"], "mode": mode})
+        assert (status, plain["message"]) == (200, "Halo ✓")
+    _jalankan(executors, fn)
+
+@pytest.mark.parametrize("path, payload", [
+    ("/encrypt", {"n": 143, "e": -7, "message": "A"}),
+    ("/encrypt", {"n": 143, "e": 1, "message": "A"}),
+    ("/encrypt", {"n": 143, "e": 143, "message": "A"}),
+    ("/encrypt", {"n": 2, "e": 1, "message": "A"}),
+    ("/encrypt", {"n": -143, "e": 7, "message": "A"}),
+    ("/decrypt", {"n": 143, "d": -103, "cipher": [65]}),
+    ("/decrypt", {"n": 143, "d": 0, "cipher": [65]}),
+    ("/decrypt", {"n": 143, "d": 143, "cipher": [65]}),
+    ("/decrypt", {"n": 143, "d": 103, "p": 1, "q": 143, "cipher": [65]}),
+    ("/decrypt", {"n": 143, "d": 103, "p": -11, "q": -13, "cipher": [65]}),
+    ("/keygen", {"bits": 64, "e": 4}),
+    ("/keygen", {"bits": 64, "e": 1}),
+    ("/keygen", {"bits": 8}),
+])
+def test_kunci_tidak_valid_ditolak(executors, path, payload):
+    async def fn(client, server):
+        status, hasil = await client.request("POST", path, payload)
+        assert status == 400 and hasil["error"]
+        # permintaan berikutnya tetap dilayani
+        status, hasil = await client.request("POST", "/encrypt", {"n": N, "e": E, "message": "A"})
+        assert (status, hasil["cipher"]) == (200, [pow(65, E, N)])
+    _jalankan(executors, fn)
+
+def test_enkripsi_tidak_menunggu_keygen(executors, monkeypatch):
+    lepas = threading.Event()
+
+    def keygen_lambat(bits, e):
+        lepas.wait(30)
+        return generate_keypair(bits, e)
+    monkeypatch.setattr(server_module, "generate_keypair", keygen_lambat)
+
+    async def fn(client, server):
+        keygen_client = ServiceClient(server.host, server.port)
+        keygen = asyncio.ensure_future(keygen_client.request("POST", "/keygen", {"bits": 64}))
+        try:
+            await asyncio.sleep(0.05)
+            status, _ = await asyncio.wait_for(
+                client.request("POST", "/encrypt", {"n": N, "e": E, "message": "A"}), 10)
+            assert status == 200 and not keygen.done()
+        finally:
+            lepas.set()
+            status, key = await keygen
+            await keygen_client.close()
+        assert status == 200 and key["n"].bit_length() == 64
+    _jalankan(executors, fn)
@@ -0,0 +1,32 @@
+import pytest
+
+from rsa_core import expcache, vector
+from rsa_core.stream import encrypt_batch
+
+pytest.importorskip("numpy")
+
+@pytest.fixture(autouse=True)
+def bersihkan_cache():
+    expcache.clear()
+    yield
+    expcache.clear()
+
+@pytest.mark.parametrize("n", [77, 143, 10007 * 10009])
+def test_sama_dengan_pow(n):
+    values = list(range(min(n, 500)))
+    for exp in [0, 1, 2, 17, 65537]:
+        assert vector.mod_exp(values, exp, n) == [pow(m, exp, n) for m in values]
+
+def test_eksponen_negatif_ditolak():
+    # exp >>= 1 pada eksponen negatif berhenti di -1: dulu kernel tidak pernah selesai
+    with pytest.raises(OverflowError):
+        vector.mod_exp([65, 66], -5, 77)
+
+def test_eksponen_negatif_kembali_ke_pow():
+    # tabel lengkap (n kecil) memuat 0 yang tidak punya invers: ValueError dari pow()
+    with pytest.raises(ValueError):
+        encrypt_batch([65, 66], -5, 77)
+    n = 10007 * 10009
+    values = [m for m in range(2, 300) if m % 10007 and m % 10009]
+    assert vector.use_vector(n, len(values))
+    assert encrypt_batch(values, -7, n) == [pow(m, -7, n) for m in values]